@@ -21,6 +21,7 @@ LOGS_DIR.mkdir(exist_ok=True)
 SERPENT_EXECUTABLE = "serpent64"
 TEST_SCRIPT = "run_bench"
 TEST_TIMEOUT = 20   # seconds
+GRACE_SECONDS = 1   # seconds between SIGTERM and SIGKILL when a test times out
 
 # Debug log format
 DEBUG_LOG_PREFIX = "DP|"
@@ -40,6 +41,16 @@ DEBUG_FIELDS = [
 # Log processing settings
 MAX_LOG_SIZE_MB = 10        # maximum log file size to process
 
+
+def _text_until(next_key):
+    """Capture free text up to the next '|next_key:' separator.
+    
+    Unrolled form of (.*?) that consumes runs of non-'|' characters and only checks the
+    lookahead at each '|', instead of retrying the remainder of the pattern at every character.
+    """
+    return rf"([^|]*(?:\|(?!{next_key}:)[^|]*)*)"
+
+
 # Readable log patterns
 LOG_PATTERNS = {
     "dp_entry": r"DP\|column:(\d+)\|row:(\d+)\|pitch:(\d+)\|perf_time:([\d.]+)\|vertical_rule:([-\d.]+)\|horizontal_rule:([-\d.]+)\|final_value:([-\d.]+)\|match:([01])\|used_pitches:\[([\d,\s]*)\]\|unused_count:([-\d]+)",
@@ -64,11 +75,11 @@ LOG_PATTERNS = {
     "cevent_summary": r"CEVENT\|row:(\d+)\|score_time:([-\d.]+)\|pitch_count:(\d+)\|time_span:([-\d.]+)\|ornament_count:(\d+)\|expected:(\d+)\|pitches_str:(\[[\d,\s]*\])",
     
     # Human-readable explanation patterns
-    "match_explanation": r"MATCH_EXPLAIN\|pitch:(\d+)\|reason:(.*?)\|score:([-\d.]+)\|timing:([\d.]+)\|context:(.*?)\|source_line:(\d+)",
-    "no_match_explanation": r"NO_MATCH_EXPLAIN\|pitch:(\d+)\|reason:(.*?)\|constraint:(.*?)\|timing:([\d.]+)\|expected:(.*?)\|source_line:(\d+)",
-    "decision_explanation": r"DECISION_EXPLAIN\|row:(\d+)\|pitch:(\d+)\|reasoning:(.*?)\|vertical_score:([-\d.]+)\|horizontal_score:([-\d.]+)\|winner:(\w+)\|confidence:([\d.]+)",
-    "timing_explanation": r"TIMING_EXPLAIN\|pitch:(\d+)\|ioi:([-\d.]+)\|limit:([-\d.]+)\|pass:(\w+)\|reason:(.*?)\|context:(.*?)",
-    "ornament_explanation": r"ORNAMENT_EXPLAIN\|pitch:(\d+)\|type:(\w+)\|processing:(.*?)\|credit:([-\d.]+)\|pitches_context:(.*?)"
+    "match_explanation": rf"MATCH_EXPLAIN\|pitch:(\d+)\|reason:{_text_until('score')}\|score:([-\d.]+)\|timing:([\d.]+)\|context:{_text_until('source_line')}\|source_line:(\d+)",
+    "no_match_explanation": rf"NO_MATCH_EXPLAIN\|pitch:(\d+)\|reason:{_text_until('constraint')}\|constraint:{_text_until('timing')}\|timing:([\d.]+)\|expected:{_text_until('source_line')}\|source_line:(\d+)",
+    "decision_explanation": rf"DECISION_EXPLAIN\|row:(\d+)\|pitch:(\d+)\|reasoning:{_text_until('vertical_score')}\|vertical_score:([-\d.]+)\|horizontal_score:([-\d.]+)\|winner:(\w+)\|confidence:([\d.]+)",
+    "timing_explanation": rf"TIMING_EXPLAIN\|pitch:(\d+)\|ioi:([-\d.]+)\|limit:([-\d.]+)\|pass:(\w+)\|reason:{_text_until('context')}\|context:(.*?)",
+    "ornament_explanation": rf"ORNAMENT_EXPLAIN\|pitch:(\d+)\|type:(\w+)\|processing:{_text_until('credit')}\|credit:([-\d.]+)\|pitches_context:(.*?)"
 }
 
 # File naming conventions
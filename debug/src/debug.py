@@ -93,8 +93,8 @@ For complete documentation, see QUICK_REFERENCE.md
         print(f"Total entries: {len(entries):,}")
         
         # Check for explanations
-        match_explanations = sum(1 for e in entries if e.match_explanation != 'na')
-        no_match_explanations = sum(1 for e in entries if e.no_match_explanation != 'na')
+        match_explanations = sum(1 for value in entries.columns['match_explanation'] if value != 'na')
+        no_match_explanations = sum(1 for value in entries.columns['no_match_explanation'] if value != 'na')
         print(f"Match explanations: {match_explanations:,}")
         print(f"No-match explanations: {no_match_explanations:,}")
         
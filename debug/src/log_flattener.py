@@ -8,22 +8,78 @@ one complete dynamic programming decision with all contextual information.
 This enables pattern analysis to identify what conditions lead to no-match/mismatch scenarios.
 """
 
+import os
 import re
-import csv
+import mmap
 import argparse
 import logging
+import queue
+from concurrent.futures import ProcessPoolExecutor, wait
+from multiprocessing import Manager
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass, fields
+from array import array
 from collections import defaultdict
+from itertools import islice, starmap
+from operator import itemgetter
 from tqdm import tqdm
 
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pa_parquet
+except ImportError:  # Optional, see requirements.txt
+    pa = None
+
 from config import LOG_PATTERNS
-from utils import setup_logging, log_with_line
+from utils import setup_logging, log_with_line, join_pitches, positive_int
 
 logger = setup_logging(__name__)
 
 
+# Integer ids for the per-line counters: one per log type, then the two line totals
+LOG_TYPE_ID = {log_type: stat_id for stat_id, log_type in enumerate(LOG_PATTERNS)}
+_TOTAL_LINES_ID = len(LOG_TYPE_ID)
+_UNMATCHED_LINES_ID = _TOTAL_LINES_ID + 1
+_STAT_NAMES = tuple(f'{log_type}_lines' for log_type in LOG_TYPE_ID) + ('total_lines', 'unmatched_lines')
+
+
+def _new_line_counts() -> array:
+    """Return zeroed line counters indexed by LOG_TYPE_ID, _TOTAL_LINES_ID and _UNMATCHED_LINES_ID."""
+    return array('Q', [0]) * len(_STAT_NAMES)
+
+
+_RECORD_PREFIX = re.compile(r'([A-Z_]+)\\\|')
+
+# Pitch lists embedded in explanation text, like [70,74,78] or [70, 74, 78]
+_PITCH_LIST_IN_TEXT = re.compile(r'\[[\d,\s]+\]')
+
+
+def _index_by_record_prefix(patterns: Dict[str, str]):
+    """Split log patterns into {record prefix: log_type} and log types without a literal prefix.
+    
+    A pattern such as "DP\\|column:..." can only match lines starting with "DP|", so its
+    prefix identifies it uniquely. Prefixes are bytes, to match raw log lines.
+    """
+    prefix_log_types = {}
+    unprefixed_log_types = []
+    for log_type, pattern in patterns.items():
+        prefix_match = _RECORD_PREFIX.match(pattern)
+        if prefix_match is None:
+            unprefixed_log_types.append(log_type)
+            continue
+        prefix = prefix_match.group(1).encode('ascii')
+        if prefix in prefix_log_types:
+            raise ValueError(f"Log patterns '{prefix_log_types[prefix]}' and '{log_type}' share record prefix '{prefix.decode()}|'")
+        prefix_log_types[prefix] = log_type
+    return prefix_log_types, unprefixed_log_types
+
+
+# Lines are matched as raw bytes from the memory map, so patterns are compiled as bytes too
+_COMPILED_PATTERNS = {name: re.compile(pattern.encode('ascii')) for name, pattern in LOG_PATTERNS.items()}
+_PREFIX_LOG_TYPES, _UNPREFIXED_LOG_TYPES = _index_by_record_prefix(LOG_PATTERNS)
+
+
 @dataclass
 class FlattenedLogEntry:
     """Complete flattened representation of a DP decision with all context.
@@ -179,104 +235,516 @@ class FlattenedLogEntry:
     bug_description: str = ""
 
 
+_FIELD_DEFAULTS = tuple((field.name, field.default) for field in fields(FlattenedLogEntry))
+_FIELD_NAMES = tuple(name for name, _ in _FIELD_DEFAULTS)
+_DEFAULTS = tuple(default for _, default in _FIELD_DEFAULTS)
+_FIELD_INDEX = {name: index for index, name in enumerate(_FIELD_NAMES)}
+# Only text fields can hold a delimiter or quote; numeric and bool fields are written unquoted
+_TEXT_FIELDS = frozenset(name for name, default in _FIELD_DEFAULTS if isinstance(default, str))
+
+_CSV_BUFFER_BYTES = 1 << 20
+_CSV_BATCH_ROWS = 10000
+
+# iter_entries() parses this many lines between checks for a full batch of entries
+_STREAM_CHUNK_LINES = 10000
+_STREAM_BATCH_ROWS = 10000
+
+
+class FlattenedLogColumns:
+    """Column-oriented (structure-of-arrays) store of flattened log entries.
+    
+    Holds one list per FlattenedLogEntry field instead of one dataclass instance per entry.
+    Indexing or iterating builds FlattenedLogEntry objects on demand.
+    """
+    
+    def __init__(self):
+        self.columns: Dict[str, List[Any]] = {name: [] for name in _FIELD_NAMES}
+        self._length = 0
+    
+    def append_values(self, values: List[Any]):
+        """Append one entry given as a full list of field values in field order."""
+        for column, value in zip(self.columns.values(), values):
+            column.append(value)
+        self._length += 1
+    
+    def extend(self, other: 'FlattenedLogColumns'):
+        """Append all entries of another column store."""
+        for name, column in self.columns.items():
+            column.extend(other.columns[name])
+        self._length += len(other)
+    
+    def __len__(self) -> int:
+        return self._length
+    
+    def __getitem__(self, index: int) -> FlattenedLogEntry:
+        return FlattenedLogEntry(*map(itemgetter(index), self.columns.values()))
+    
+    def __iter__(self):
+        return starmap(FlattenedLogEntry, self.rows())
+    
+    def rows(self):
+        """Iterate entries as positional tuples in field order, without building dataclasses."""
+        return zip(*self.columns.values())
+
+
+def _apply_fields(values: List[Any], data: Dict[str, Any]):
+    """Write the entries of data that are FlattenedLogEntry fields into their positions in values."""
+    for key, value in data.items():
+        index = _FIELD_INDEX.get(key)
+        if index is not None:
+            values[index] = value
+
+
+def _extract_dp_entry(groups) -> Dict[str, Any]:
+    """Extract the fields of a DP| line."""
+    column, row, pitch, perf_time, vertical_rule, horizontal_rule, final_value, match_flag, used_pitches, unused_count = groups
+    return {
+        'dp_row': int(row),
+        'dp_vertical_rule': float(vertical_rule),
+        'dp_horizontal_rule': float(horizontal_rule),
+        'dp_final_value': float(final_value),
+        'dp_match': int(match_flag),
+        'dp_used_pitches': used_pitches.decode(),
+        'dp_unused_count': int(unused_count)
+    }
+
+
+def _extract_cell_state(groups) -> Dict[str, Any]:
+    """Extract the fields of a CELL| line."""
+    row, value, used_pitches, unused_count, cell_time, score_time = groups
+    return {
+        'row': int(row),
+        'cell_time': float(cell_time),
+        'cell_value': float(value),
+        'cell_used_pitches': used_pitches.decode(),
+        'cell_unused_count': int(unused_count),
+        'cell_score_time': float(score_time)
+    }
+
+
+def _extract_timing_check(groups) -> Dict[str, Any]:
+    """Extract the fields of a TIMING| line."""
+    prev_cell_time, curr_perf_time, ioi, span, limit, timing_pass, constraint_type = groups
+    prev_cell_time_value = float(prev_cell_time)
+    ioi_value = float(ioi)
+    has_timing_bug = prev_cell_time_value == -1.0 and ioi_value > 20.0
+    return {
+        'timing_prev_cell_time': prev_cell_time_value,
+        'timing_curr_perf_time': float(curr_perf_time),
+        'timing_ioi': ioi_value,
+        'timing_span': float(span),
+        'timing_limit': float(limit),
+        'timing_pass': timing_pass.decode(),
+        'timing_constraint_type': constraint_type.decode(),
+        'bug_has_timing_bug': has_timing_bug,
+        # Keep the logged ioi text verbatim in the description
+        'bug_description': f"Cell time initialization bug: prev_time=-1, ioi={ioi.decode()}" if has_timing_bug else ""
+    }
+
+
+def _extract_cevent_summary(groups) -> Dict[str, Any]:
+    """Extract the fields of a CEVENT| line."""
+    row, score_time, pitch_count, time_span, ornament_count, expected, pitches_str = groups
+    return {
+        'row': int(row),
+        'cevent_row': int(row),
+        'cevent_score_time': float(score_time),
+        'cevent_pitch_count': int(pitch_count),
+        'cevent_time_span': float(time_span),
+        'cevent_ornament_count': int(ornament_count),
+        'cevent_expected': int(expected),
+        'cevent_pitches_str': pitches_str.decode()
+    }
+
+
+def _extract_vertical_rule(groups) -> Dict[str, Any]:
+    """Extract the fields of a VRULE| line."""
+    row, up_value, penalty, result, start_point = groups
+    return {
+        'row': int(row),
+        'vrule_up_value': float(up_value),
+        'vrule_penalty': float(penalty),
+        'vrule_result': float(result),
+        'vrule_start_point': start_point.decode()
+    }
+
+
+def _extract_horizontal_rule(groups) -> Dict[str, Any]:
+    """Extract the fields of a HRULE| line."""
+    row, prev_value, pitch, ioi, limit, timing_pass, match_type, result = groups
+    return {
+        'row': int(row),
+        'hrule_prev_value': float(prev_value),
+        'hrule_ioi': float(ioi),
+        'hrule_limit': float(limit),
+        'hrule_timing_pass': timing_pass.decode(),
+        'hrule_match_type': match_type.decode(),
+        'hrule_result': float(result)
+    }
+
+
+def _extract_match_type(groups) -> Dict[str, Any]:
+    """Extract the fields of a MATCH_TYPE| line."""
+    pitch, is_chord, is_trill, is_grace, is_extra, is_ignored, already_used, timing_ok, ornament_info = groups
+    return {
+        'matchtype_is_chord': is_chord.decode(),
+        'matchtype_is_trill': is_trill.decode(),
+        'matchtype_is_grace': is_grace.decode(),
+        'matchtype_is_extra': is_extra.decode(),
+        'matchtype_is_ignored': is_ignored.decode(),
+        'matchtype_already_used': already_used.decode(),
+        'matchtype_timing_ok': timing_ok.decode(),
+        'matchtype_ornament_info': ornament_info.decode()
+    }
+
+
+def _extract_cell_decision(groups) -> Dict[str, Any]:
+    """Extract the fields of a DECISION| line."""
+    row, vertical_result, horizontal_result, winner, updated, final_value, reason = groups
+    return {
+        'row': int(row),
+        'decision_vertical_result': float(vertical_result),
+        'decision_horizontal_result': float(horizontal_result),
+        'decision_winner': winner.decode(),
+        'decision_updated': updated.decode(),
+        'decision_final_value': float(final_value),
+        'decision_reason': reason.decode()
+    }
+
+
+def _extract_score_competition(groups) -> Dict[str, Any]:
+    """Extract the fields of a SCORE| line."""
+    row, current_score, top_score, beats_top, margin, confidence = groups
+    return {
+        'row': int(row),
+        'score_current_score': float(current_score),
+        'score_top_score': float(top_score),
+        'score_beats_top': beats_top.decode(),
+        'score_margin': float(margin),
+        'score_confidence': float(confidence)
+    }
+
+
+def _extract_ornament_processing(groups) -> Dict[str, Any]:
+    """Extract the fields of an ORNAMENT| line."""
+    pitch, ornament_type, trill_pitches, grace_pitches, ignore_pitches, credit_applied, trill_str, grace_str, ignore_str = groups
+    return {
+        'ornament_type': ornament_type.decode(),
+        'ornament_trill_pitches': trill_pitches.decode(),
+        'ornament_grace_pitches': grace_pitches.decode(),
+        'ornament_ignore_pitches': ignore_pitches.decode(),
+        'ornament_credit_applied': float(credit_applied),
+        'ornament_trill_pitches_str': trill_str.decode(),
+        'ornament_grace_pitches_str': grace_str.decode(),
+        'ornament_ignore_pitches_str': ignore_str.decode()
+    }
+
+
+def _extract_matrix_state(groups) -> Dict[str, Any]:
+    """Extract the fields of a MATRIX| line."""
+    column, window_start, window_end, window_center, current_base, prev_base, current_upper, prev_upper = groups
+    return {
+        'matrix_window_start': int(window_start),
+        'matrix_window_end': int(window_end),
+        'matrix_window_center': int(window_center),
+        'matrix_current_base': int(current_base),
+        'matrix_prev_base': int(prev_base),
+        'matrix_current_upper': int(current_upper),
+        'matrix_prev_upper': int(prev_upper)
+    }
+
+
+def _extract_array_neighborhood(groups) -> Dict[str, Any]:
+    """Extract the fields of an ARRAY| line."""
+    row, center_value, values, positions = groups
+    return {
+        'row': int(row),
+        'array_center_value': float(center_value),
+        'array_neighbor_values': values.decode(),
+        'array_neighbor_positions': positions.decode()
+    }
+
+
+def _extract_match_explanation(groups) -> Dict[str, Any]:
+    """Extract the fields of a MATCH_EXPLAIN| line."""
+    pitch, reason, score, timing, context, source_line = (group.decode() for group in groups)
+    return {
+        'match_explanation': f"Pitch {pitch} matched: {reason} (score={score}, timing={timing}, context={context}, source_line={source_line})"
+    }
+
+
+def _extract_no_match_explanation(groups) -> Dict[str, Any]:
+    """Extract the fields of a NO_MATCH_EXPLAIN| line."""
+    pitch, reason, constraint, timing, expected, source_line = (group.decode() for group in groups)
+    return {
+        'no_match_explanation': f"Pitch {pitch} no match: {reason} (constraint={constraint}, timing={timing}, expected={expected}, source_line={source_line})"
+    }
+
+
+def _extract_decision_explanation(groups) -> Dict[str, Any]:
+    """Extract the fields of a DECISION_EXPLAIN| line."""
+    row, pitch, reasoning, vertical_score, horizontal_score, winner, confidence = (group.decode() for group in groups)
+    return {
+        'decision_explanation': f"Row {row} pitch {pitch}: {reasoning} (vertical={vertical_score}, horizontal={horizontal_score}, winner={winner}, confidence={confidence})"
+    }
+
+
+def _extract_timing_explanation(groups) -> Dict[str, Any]:
+    """Extract the fields of a TIMING_EXPLAIN| line."""
+    pitch, ioi, limit, pass_status, reason, context = (group.decode() for group in groups)
+    return {
+        'timing_explanation': f"Pitch {pitch} timing: {reason} (IOI={ioi}, limit={limit}, pass={pass_status}, context={context})"
+    }
+
+
+def _extract_ornament_explanation(groups) -> Dict[str, Any]:
+    """Extract the fields of an ORNAMENT_EXPLAIN| line."""
+    pitch, orn_type, processing, credit, pitches_context = (group.decode() for group in groups)
+    return {
+        'ornament_explanation': f"Pitch {pitch} ornament {orn_type}: {processing} (credit={credit}, context={pitches_context})"
+    }
+
+
+# Field extractor for each log type, keyed like LOG_PATTERNS
+_EXTRACTORS = {
+    'dp_entry': _extract_dp_entry,
+    'cell_state': _extract_cell_state,
+    'timing_check': _extract_timing_check,
+    'cevent_summary': _extract_cevent_summary,
+    'vertical_rule': _extract_vertical_rule,
+    'horizontal_rule': _extract_horizontal_rule,
+    'match_type': _extract_match_type,
+    'cell_decision': _extract_cell_decision,
+    'score_competition': _extract_score_competition,
+    'ornament_processing': _extract_ornament_processing,
+    'matrix_state': _extract_matrix_state,
+    'array_neighborhood': _extract_array_neighborhood,
+    'match_explanation': _extract_match_explanation,
+    'no_match_explanation': _extract_no_match_explanation,
+    'decision_explanation': _extract_decision_explanation,
+    'timing_explanation': _extract_timing_explanation,
+    'ornament_explanation': _extract_ornament_explanation,
+}
+
+
 class LogFlattener:
     """Flattens multi-line log entries into single CSV rows for analysis."""
     
     def __init__(self):
-        self.patterns = {name: re.compile(pattern) for name, pattern in LOG_PATTERNS.items()}
-        self.current_input_logs = []  # All logs for current input
-        self.completed_entries = []
-        self.stats = defaultdict(int)
+        # Compiled once at import and shared by every instance (and every worker process)
+        self.patterns = _COMPILED_PATTERNS
+        self.prefix_log_types = _PREFIX_LOG_TYPES
+        self.unprefixed_log_types = _UNPREFIXED_LOG_TYPES
+        self.current_input_logs = []  # (line, classification) for all logs of the current input
+        self.completed_entries = FlattenedLogColumns()
+        self.yielded_entries = 0  # Entries already handed out by iter_entries()
+        self.line_counts = _new_line_counts()
+        
+    def _classify(self, line: bytes):
+        """Return (log_type, match) for the pattern that matches the line, or None.
         
-    def parse_log_file(self, log_file_path: Path) -> List[FlattenedLogEntry]:
+        The record prefix before the first '|' (DP, CELL, MATCH, ...) selects the single
+        pattern to try, so most lines cost one dict lookup and one regex match. Patterns
+        without a literal prefix (currently none) are tried afterwards in order.
+        """
+        log_type = self.prefix_log_types.get(line.partition(b'|')[0])
+        if log_type is not None:
+            match = self.patterns[log_type].match(line)
+            if match:
+                return log_type, match
+        
+        for log_type in self.unprefixed_log_types:
+            match = self.patterns[log_type].match(line)
+            if match:
+                return log_type, match
+        return None
+    
+    def parse_log_file(self, log_file_path: Path) -> FlattenedLogColumns:
         """Parse a log file and return flattened entries."""
+        entries = FlattenedLogColumns()
+        for batch in self.iter_entries(log_file_path):
+            entries.extend(batch)
+        return entries
+    
+    def iter_entries(self, log_file_path: Path, batch_rows: int = _STREAM_BATCH_ROWS):
+        """Parse a log file and yield flattened entries in file order, in batches.
+        
+        A batch is yielded as soon as at least batch_rows entries are complete, so only about
+        one batch is held in memory regardless of the log size.
+        """
         logger.info(f"Parsing log file: {log_file_path}")
         
-        self.current_input_logs = []
-        self.completed_entries = []
-        self.stats = defaultdict(int)
+        self._reset()
         
-        # Get total number of lines for progress bar
-        logger.info("Counting lines for progress tracking...")
-        with open(log_file_path, 'r', encoding='utf-8') as f:
-            total_lines = sum(1 for _ in f)
+        # Track progress in bytes so the file is only read once
+        total_bytes = Path(log_file_path).stat().st_size
+        logger.info(f"Processing {total_bytes:,} bytes...")
         
-        logger.info(f"Processing {total_lines:,} lines...")
+        lines = _iter_mmap_lines(log_file_path)
+        line_num = 1
+        with tqdm(total=total_bytes, desc="Parsing log", unit="B", unit_scale=True,
+                 bar_format="{l_bar}{bar}| {n_fmt}/{total_fmt} [{elapsed}<{remaining}, {rate_fmt}]") as pbar:
+            while True:
+                next_line_num = self._parse_lines(islice(lines, _STREAM_CHUNK_LINES), line_num, pbar)
+                if next_line_num == line_num:
+                    break
+                line_num = next_line_num
+                if len(self.completed_entries) >= batch_rows:
+                    yield self._take_completed_entries()
         
-        with open(log_file_path, 'r', encoding='utf-8') as f:
-            with tqdm(total=total_lines, desc="Parsing log", unit="lines", 
-                     bar_format="{l_bar}{bar}| {n_fmt}/{total_fmt} [{elapsed}<{remaining}, {rate_fmt}]") as pbar:
-                
-                for line_num, line in enumerate(f, 1):
-                    line = line.strip()
-                    if not line or line.startswith('#'):
-                        pbar.update(1)
-                        continue
-                        
-                    try:
-                        self._process_line(line, line_num)
-                    except Exception as e:
-                        # Log warning but continue processing - individual line failures shouldn't kill entire process
-                        log_with_line(logger, logging.WARNING, f"Error processing line {line_num}: {e}", context=f"line_content={line.strip()[:100]}")
-                        continue
-                    
-                    pbar.update(1)
-                    
-                    # Update progress description periodically
-                    if line_num % 5000 == 0:
-                        entries_so_far = len(self.completed_entries)
-                        pbar.set_description(f"Parsing log ({entries_so_far} entries)")
-        
-        # Process any remaining input
-        if self.current_input_logs:
-            self._process_input_logs()
+        self._finish()
+        if self.completed_entries:
+            yield self._take_completed_entries()
         
-        logger.info(f"Processed {len(self.completed_entries)} complete entries")
+        logger.info(f"Processed {self.yielded_entries} complete entries")
         self._log_stats()
+    
+    def parse_log_file_parallel(self, log_file_path: Path, workers: Optional[int] = None) -> FlattenedLogColumns:
+        """Parse a log file across worker processes and return flattened entries."""
+        entries = FlattenedLogColumns()
+        for batch in self.iter_entries_parallel(log_file_path, workers):
+            entries.extend(batch)
+        return entries
+    
+    def iter_entries_parallel(self, log_file_path: Path, workers: Optional[int] = None):
+        """Parse a log file across worker processes and yield each worker's entries in file order.
         
+        The file is split into contiguous byte ranges that start on INPUT| lines. Each INPUT
+        block is self-contained, so every range parses independently; concatenated in file
+        order the results match iter_entries() exactly. Workers report parsed bytes through a
+        shared queue so the progress bar advances as one bar over the whole file.
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+        elif workers < 1:
+            error_msg = f"workers must be at least 1, got {workers}"
+            log_with_line(logger, logging.ERROR, error_msg)
+            raise ValueError(error_msg)
+        logger.info(f"Parsing log file: {log_file_path} ({workers} workers)")
+        
+        ranges = _split_at_input_boundaries(log_file_path, workers)
+        logger.info(f"Split log into {len(ranges)} chunks")
+        
+        self._reset()
+        
+        total_bytes = Path(log_file_path).stat().st_size
+        with Manager() as manager, ProcessPoolExecutor(max_workers=min(workers, len(ranges))) as executor:
+            progress_queue = manager.Queue()
+            futures = [executor.submit(_parse_log_range, log_file_path, start, end, first_line_num, progress_queue)
+                       for start, end, first_line_num in ranges]
+            with tqdm(total=total_bytes, desc="Parsing log", unit="B", unit_scale=True,
+                     bar_format="{l_bar}{bar}| {n_fmt}/{total_fmt} [{elapsed}<{remaining}, {rate_fmt}]") as pbar:
+                for future in futures:
+                    while not future.done():
+                        wait([future], timeout=0.1)
+                        _drain_progress(progress_queue, pbar)
+                    entries, line_counts = future.result()
+                    for stat_id, count in enumerate(line_counts):
+                        self.line_counts[stat_id] += count
+                    self.yielded_entries += len(entries)
+                    yield entries
+                _drain_progress(progress_queue, pbar)
+        
+        logger.info(f"Processed {self.yielded_entries} complete entries")
+        self._log_stats()
+    
+    def parse_log_range(self, log_file_path: Path, start: int, end: int, first_line_num: int,
+                        pbar=None) -> FlattenedLogColumns:
+        """Parse the lines in byte range [start, end) of a log file."""
+        self._reset()
+        self._parse_lines(_iter_mmap_lines(log_file_path, start, end), first_line_num, pbar)
+        self._finish()
         return self.completed_entries
     
-    def _process_line(self, line: str, line_num: int):
+    def _reset(self):
+        """Clear all parse state before a new run."""
+        self.current_input_logs = []
+        self.completed_entries = FlattenedLogColumns()
+        self.yielded_entries = 0
+        self.line_counts = _new_line_counts()
+    
+    def _take_completed_entries(self) -> FlattenedLogColumns:
+        """Hand over the completed entries and start collecting a new batch."""
+        entries = self.completed_entries
+        self.completed_entries = FlattenedLogColumns()
+        self.yielded_entries += len(entries)
+        return entries
+    
+    def _parse_lines(self, lines, first_line_num: int, pbar=None) -> int:
+        """Feed (line, size_in_bytes) pairs through the line processor.
+        
+        Returns the line number following the last line consumed.
+        """
+        line_num = first_line_num - 1
+        for line_num, (line, line_size) in enumerate(lines, first_line_num):
+            if pbar is not None:
+                pbar.update(line_size)
+                
+                # Update progress description periodically
+                if line_num % 5000 == 0:
+                    entries_so_far = self.yielded_entries + len(self.completed_entries)
+                    pbar.set_description(f"Parsing log ({entries_so_far} entries)")
+            
+            line = line.strip()
+            if not line or line.startswith(b'#'):
+                continue
+                
+            try:
+                self._process_line(line, line_num)
+            except Exception as e:
+                # Log warning but continue processing - individual line failures shouldn't kill entire process
+                log_with_line(logger, logging.WARNING, f"Error processing line {line_num}: {e}", context=f"line_content={line[:100].decode('utf-8', 'replace')}")
+                continue
+        return line_num + 1
+    
+    def _finish(self):
+        """Process any remaining input."""
+        if self.current_input_logs:
+            self._process_input_logs()
+    
+    def _process_line(self, line: bytes, line_num: int):
         """Process a single log line by collecting it for later processing."""
-        self.stats['total_lines'] += 1
+        self.line_counts[_TOTAL_LINES_ID] += 1
         
         # Check if this is an INPUT line (starts new input block)
-        if line.startswith('INPUT|'):
+        if line.startswith(b'INPUT|'):
             # Process any previous input block
-            if self.current_input_logs:
-                self._process_input_logs()
-            # Start new input block
-            self.current_input_logs = [line]
+            try:
+                if self.current_input_logs:
+                    self._process_input_logs()
+            finally:
+                # Start new input block, even if the previous one failed, so serial parsing
+                # keeps the same blocks as parallel parsing (where every range starts on INPUT)
+                self.current_input_logs = [(line, None)]
             return
         
         # Check if this is a MATCH/NO_MATCH (ends current input block)
-        if line.startswith('MATCH|') or line.startswith('NO_MATCH|'):
+        if line.startswith(b'MATCH|') or line.startswith(b'NO_MATCH|'):
             # Add to current block but don't process yet - wait for explanation
-            self.current_input_logs.append(line)
+            self.current_input_logs.append((line, None))
             return
         
         # Check if this is an explanation (follows MATCH/NO_MATCH)
-        if line.startswith('MATCH_EXPLAIN|') or line.startswith('NO_MATCH_EXPLAIN|'):
+        if line.startswith(b'MATCH_EXPLAIN|') or line.startswith(b'NO_MATCH_EXPLAIN|'):
             # Add explanation to current block and then process it
             if self.current_input_logs:
-                self.current_input_logs.append(line)
+                self.current_input_logs.append((line, self._classify(line)))
                 self._process_input_logs()
             return
         
+        # Classify once: the result feeds both the stats and the later block processing
+        classified = self._classify(line)
+        
         # Add to current input block if we have one
         if self.current_input_logs:
-            self.current_input_logs.append(line)
+            self.current_input_logs.append((line, classified))
         
         # Track unmatched lines for stats
-        matched = False
-        for log_type, pattern in self.patterns.items():
-            if pattern.match(line):
-                self.stats[f'{log_type}_lines'] += 1
-                matched = True
-                break
+        if classified:
+            self.line_counts[LOG_TYPE_ID[classified[0]]] += 1
         
-        if not matched and not line.startswith(('MATCH|', 'NO_MATCH|', 'INPUT|')):
-            self.stats['unmatched_lines'] += 1
+        if not classified and not line.startswith((b'MATCH|', b'NO_MATCH|', b'INPUT|')):
+            self.line_counts[_UNMATCHED_LINES_ID] += 1
     
 
     def _process_input_logs(self):
@@ -286,110 +754,98 @@ class LogFlattener:
             
         logger.debug(f"Processing input block with {len(self.current_input_logs)} log lines")
         
-        # Parse all logs into structured data
-        input_data = {}
-        dp_entries = {}
-        result_data = {}
+        try:
+            # Parse all logs into structured data
+            input_data = {}
+            dp_entries = {}
+            result_data = {}
         
-        for line in self.current_input_logs:
-            log_entry = self._parse_single_line(line)
-            if not log_entry:
-                continue
+            for line, classified in self.current_input_logs:
+                log_entry = self._parse_single_line(line, classified)
+                if not log_entry:
+                    continue
                 
-            log_type, data = log_entry
+                log_type, data = log_entry
             
-            if log_type == 'input_event':
-                input_data = data
-            elif log_type == 'dp_entry':
-                row = data['dp_row']
-                if row not in dp_entries:
-                    dp_entries[row] = {}
-                dp_entries[row]['dp'] = data
-            elif log_type in ['cevent_summary', 'cell_state', 'vertical_rule', 'horizontal_rule', 
-                              'timing_check', 'match_type', 'cell_decision', 'score_competition',
-                              'ornament_processing', 'matrix_state', 'array_neighborhood',
-                              'match_explanation', 'no_match_explanation', 'decision_explanation', 
-                              'timing_explanation', 'ornament_explanation']:
-                # Store by row if it has row info, otherwise apply to all
-                if 'row' in data:
-                    row = data['row']
+                if log_type == 'input_event':
+                    input_data = data
+                elif log_type == 'dp_entry':
+                    row = data['dp_row']
                     if row not in dp_entries:
                         dp_entries[row] = {}
-                    dp_entries[row][log_type] = data
-                else:
-                    # Matrix state and explanations apply to all entries
-                    # For explanations, merge the data fields directly into input_data
-                    if log_type in ['match_explanation', 'no_match_explanation', 'timing_explanation', 'ornament_explanation']:
-                        input_data.update(data)
+                    dp_entries[row]['dp'] = data
+                elif log_type in ['cevent_summary', 'cell_state', 'vertical_rule', 'horizontal_rule', 
+                                  'timing_check', 'match_type', 'cell_decision', 'score_competition',
+                                  'ornament_processing', 'matrix_state', 'array_neighborhood',
+                                  'match_explanation', 'no_match_explanation', 'decision_explanation', 
+                                  'timing_explanation', 'ornament_explanation']:
+                    # Store by row if it has row info, otherwise apply to all
+                    if 'row' in data:
+                        row = data['row']
+                        if row not in dp_entries:
+                            dp_entries[row] = {}
+                        dp_entries[row][log_type] = data
                     else:
-                        input_data[log_type] = data
-            elif log_type in ['match_found', 'no_match']:
-                result_data = {'type': log_type, 'data': data}
-        
-        # Create flattened entries
-        for row, row_data in dp_entries.items():
-            if 'dp' not in row_data:
-                continue  # Skip if no DP entry for this row
+                        # Matrix state, explanations and other row-less data apply to all entries
+                        input_data.update(data)
+                elif log_type in ['match_found', 'no_match']:
+                    result_data = {'type': log_type, 'data': data}
+        
+            # Input data applies to every entry of the block, so fill it in once
+            block_values = list(_DEFAULTS)
+            _apply_fields(block_values, input_data)
+        
+            # Create flattened entries
+            for row, row_data in dp_entries.items():
+                if 'dp' not in row_data:
+                    continue  # Skip if no DP entry for this row
                 
-            entry = FlattenedLogEntry()
+                values = block_values.copy()
             
-            # Apply input data
-            for key, value in input_data.items():
-                if isinstance(value, dict):
-                    # Matrix state or similar - apply all fields
-                    for field, field_value in value.items():
-                        if hasattr(entry, field):
-                            setattr(entry, field, field_value)
-                else:
-                    if hasattr(entry, key):
-                        setattr(entry, key, value)
+                # Apply DP data
+                _apply_fields(values, row_data['dp'])
             
-            # Apply DP data
-            for key, value in row_data['dp'].items():
-                if hasattr(entry, key):
-                    setattr(entry, key, value)
+                # Apply other row-specific data
+                for log_type, data in row_data.items():
+                    if log_type != 'dp':
+                        _apply_fields(values, data)
             
-            # Apply other row-specific data
-            for log_type, data in row_data.items():
-                if log_type != 'dp':
-                    for key, value in data.items():
-                        if hasattr(entry, key):
-                            setattr(entry, key, value)
+                # Apply result data
+                if result_data:
+                    if result_data['type'] == 'match_found':
+                        values[_FIELD_INDEX['result_type']] = 'match'
+                        _apply_fields(values, result_data['data'])
+                    elif result_data['type'] == 'no_match':
+                        values[_FIELD_INDEX['result_type']] = 'no_match'
+                        _apply_fields(values, result_data['data'])
             
-            # Apply result data
-            if result_data:
-                if result_data['type'] == 'match_found':
-                    entry.result_type = 'match'
-                    for key, value in result_data['data'].items():
-                        if hasattr(entry, key):
-                            setattr(entry, key, value)
-                elif result_data['type'] == 'no_match':
-                    entry.result_type = 'no_match'
-                    for key, value in result_data['data'].items():
-                        if hasattr(entry, key):
-                            setattr(entry, key, value)
-            
-            self.completed_entries.append(entry)
+                self.completed_entries.append_values(values)
         
-        # Clear for next input
-        self.current_input_logs = []
+        finally:
+            # Clear for next input, even if a line of this block failed to parse
+            self.current_input_logs = []
 
-    def _parse_single_line(self, line: str):
-        """Parse a single line and return (log_type, data) or None."""
+    def _parse_single_line(self, line: bytes, classified):
+        """Parse a single line and return (log_type, data) or None.
+        
+        classified is the (log_type, match) that _process_line already got from _classify(),
+        so the line's pattern is not matched a second time.
+        """
         
         # Handle special cases first
-        if line.startswith('MATCH|'):
+        if line.startswith(b'MATCH|'):
             match = self.patterns['match_found'].match(line)
             if match:
                 row, pitch, perf_time, score = match.groups()
                 return ('match_found', {
                     'match_row': int(row),
-                    'match_pitch': int(pitch), 
+                    'match_pitch': int(pitch),
                     'match_perf_time': float(perf_time),
                     'match_score': float(score)
                 })
+            return None
         
-        if line.startswith('NO_MATCH|'):
+        if line.startswith(b'NO_MATCH|'):
             match = self.patterns['no_match'].match(line)
             if match:
                 pitch, perf_time = match.groups()
@@ -397,201 +853,41 @@ class LogFlattener:
                     'no_match_pitch': int(pitch),
                     'no_match_perf_time': float(perf_time)
                 })
+            return None
         
-        # Try all patterns
-        for log_type, pattern in self.patterns.items():
-            match = pattern.match(line)
+        if line.startswith(b'INPUT|'):
+            match = self.patterns['input_event'].match(line)
             if match:
-                return (log_type, self._extract_data(log_type, match))
+                column, pitch, perf_time = match.groups()
+                return ('input_event', {
+                    'input_column': int(column),
+                    'input_pitch': int(pitch),
+                    'input_perf_time': float(perf_time)
+                })
+            return None
+        
+        if classified:
+            log_type, match = classified
+            return (log_type, self._extract_data(log_type, match))
         
         return None
     
     def _extract_data(self, log_type: str, match):
-        """Extract data from a matched pattern into a dictionary."""
-        groups = match.groups()
-        
-        if log_type == 'input_event':
-            column, pitch, perf_time = groups
-            return {
-                'input_column': int(column),
-                'input_pitch': int(pitch),
-                'input_perf_time': float(perf_time)
-            }
-        
-        elif log_type == 'dp_entry':
-            column, row, pitch, perf_time, vertical_rule, horizontal_rule, final_value, match_flag, used_pitches, unused_count = groups
-            return {
-                'dp_row': int(row),
-                'dp_vertical_rule': float(vertical_rule),
-                'dp_horizontal_rule': float(horizontal_rule),
-                'dp_final_value': float(final_value),
-                'dp_match': int(match_flag),
-                'dp_used_pitches': used_pitches,
-                'dp_unused_count': int(unused_count)
-            }
-        
-        elif log_type == 'cevent_summary':
-            row, score_time, pitch_count, time_span, ornament_count, expected, pitches_str = groups
-            return {
-                'row': int(row),
-                'cevent_row': int(row),
-                'cevent_score_time': float(score_time),
-                'cevent_pitch_count': int(pitch_count),
-                'cevent_time_span': float(time_span),
-                'cevent_ornament_count': int(ornament_count),
-                'cevent_expected': int(expected),
-                'cevent_pitches_str': pitches_str
-            }
-        
-        elif log_type == 'cell_state':
-            row, value, used_pitches, unused_count, cell_time, score_time = groups
-            return {
-                'row': int(row),
-                'cell_time': float(cell_time),
-                'cell_value': float(value),
-                'cell_used_pitches': used_pitches,
-                'cell_unused_count': int(unused_count),
-                'cell_score_time': float(score_time)
-            }
-        
-        elif log_type == 'vertical_rule':
-            row, up_value, penalty, result, start_point = groups
-            return {
-                'row': int(row),
-                'vrule_up_value': float(up_value),
-                'vrule_penalty': float(penalty),
-                'vrule_result': float(result),
-                'vrule_start_point': start_point
-            }
-        
-        elif log_type == 'horizontal_rule':
-            row, prev_value, pitch, ioi, limit, timing_pass, match_type, result = groups
-            return {
-                'row': int(row),
-                'hrule_prev_value': float(prev_value),
-                'hrule_ioi': float(ioi),
-                'hrule_limit': float(limit),
-                'hrule_timing_pass': timing_pass,
-                'hrule_match_type': match_type,
-                'hrule_result': float(result)
-            }
-        
-        elif log_type == 'timing_check':
-            prev_cell_time, curr_perf_time, ioi, span, limit, timing_pass, constraint_type = groups
-            return {
-                'timing_prev_cell_time': float(prev_cell_time),
-                'timing_curr_perf_time': float(curr_perf_time),
-                'timing_ioi': float(ioi),
-                'timing_span': float(span),
-                'timing_limit': float(limit),
-                'timing_pass': timing_pass,
-                'timing_constraint_type': constraint_type,
-                'bug_has_timing_bug': float(prev_cell_time) == -1.0 and float(ioi) > 20.0,
-                'bug_description': f"Cell time initialization bug: prev_time=-1, ioi={ioi}" if float(prev_cell_time) == -1.0 and float(ioi) > 20.0 else ""
-            }
-        
-        elif log_type == 'match_type':
-            pitch, is_chord, is_trill, is_grace, is_extra, is_ignored, already_used, timing_ok, ornament_info = groups
-            return {
-                'matchtype_is_chord': is_chord,
-                'matchtype_is_trill': is_trill,
-                'matchtype_is_grace': is_grace,
-                'matchtype_is_extra': is_extra,
-                'matchtype_is_ignored': is_ignored,
-                'matchtype_already_used': already_used,
-                'matchtype_timing_ok': timing_ok,
-                'matchtype_ornament_info': ornament_info
-            }
-        
-        elif log_type == 'cell_decision':
-            row, vertical_result, horizontal_result, winner, updated, final_value, reason = groups
-            return {
-                'row': int(row),
-                'decision_vertical_result': float(vertical_result),
-                'decision_horizontal_result': float(horizontal_result),
-                'decision_winner': winner,
-                'decision_updated': updated,
-                'decision_final_value': float(final_value),
-                'decision_reason': reason
-            }
-        
-        elif log_type == 'score_competition':
-            row, current_score, top_score, beats_top, margin, confidence = groups
-            return {
-                'row': int(row),
-                'score_current_score': float(current_score),
-                'score_top_score': float(top_score),
-                'score_beats_top': beats_top,
-                'score_margin': float(margin),
-                'score_confidence': float(confidence)
-            }
-        
-        elif log_type == 'ornament_processing':
-            pitch, ornament_type, trill_pitches, grace_pitches, ignore_pitches, credit_applied, trill_str, grace_str, ignore_str = groups
-            return {
-                'ornament_type': ornament_type,
-                'ornament_trill_pitches': trill_pitches,
-                'ornament_grace_pitches': grace_pitches,
-                'ornament_ignore_pitches': ignore_pitches,
-                'ornament_credit_applied': float(credit_applied),
-                'ornament_trill_pitches_str': trill_str,
-                'ornament_grace_pitches_str': grace_str,
-                'ornament_ignore_pitches_str': ignore_str
-            }
+        """Extract data from a matched pattern into a dictionary.
         
-        elif log_type == 'matrix_state':
-            column, window_start, window_end, window_center, current_base, prev_base, current_upper, prev_upper = groups
-            return {
-                'matrix_window_start': int(window_start),
-                'matrix_window_end': int(window_end),
-                'matrix_window_center': int(window_center),
-                'matrix_current_base': int(current_base),
-                'matrix_prev_base': int(prev_base),
-                'matrix_current_upper': int(current_upper),
-                'matrix_prev_upper': int(prev_upper)
-            }
-        
-        elif log_type == 'array_neighborhood':
-            row, center_value, values, positions = groups
-            return {
-                'row': int(row),
-                'array_center_value': float(center_value),
-                'array_neighbor_values': values,
-                'array_neighbor_positions': positions
-            }
-        
-        elif log_type == 'match_explanation':
-            pitch, reason, score, timing, context, source_line = groups
-            return {
-                'match_explanation': f"Pitch {pitch} matched: {reason} (score={score}, timing={timing}, context={context}, source_line={source_line})"
-            }
-        
-        elif log_type == 'no_match_explanation':
-            pitch, reason, constraint, timing, expected, source_line = groups
-            return {
-                'no_match_explanation': f"Pitch {pitch} no match: {reason} (constraint={constraint}, timing={timing}, expected={expected}, source_line={source_line})"
-            }
-        
-        elif log_type == 'decision_explanation':
-            row, pitch, reasoning, vertical_score, horizontal_score, winner, confidence = groups
-            return {
-                'decision_explanation': f"Row {row} pitch {pitch}: {reasoning} (vertical={vertical_score}, horizontal={horizontal_score}, winner={winner}, confidence={confidence})"
-            }
-        
-        elif log_type == 'timing_explanation':
-            pitch, ioi, limit, pass_status, reason, context = groups
-            return {
-                'timing_explanation': f"Pitch {pitch} timing: {reason} (IOI={ioi}, limit={limit}, pass={pass_status}, context={context})"
-            }
-        
-        elif log_type == 'ornament_explanation':
-            pitch, orn_type, processing, credit, pitches_context = groups
-            return {
-                'ornament_explanation': f"Pitch {pitch} ornament {orn_type}: {processing} (credit={credit}, context={pitches_context})"
-            }
-        
-        # Default: return empty dict for unknown types
-        return {}
+        Each log type has its own extractor in _EXTRACTORS, so there is one dict lookup per
+        line instead of a comparison per log type. Groups are bytes: int() and float() take
+        them directly, and only string-typed fields are decoded.
+        """
+        extractor = _EXTRACTORS.get(log_type)
+        if extractor is None:
+            return {}  # Log types without fields of their own
+        return extractor(match.groups())
+    
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Nonzero line counters by name ('<log_type>_lines', 'total_lines', 'unmatched_lines')."""
+        return {name: count for name, count in zip(_STAT_NAMES, self.line_counts) if count}
     
     def _log_stats(self):
         """Log parsing statistics."""
@@ -599,47 +895,69 @@ class LogFlattener:
         for stat_name, count in sorted(self.stats.items()):
             logger.info(f"  {stat_name}: {count}")
     
-    def write_csv(self, entries: List[FlattenedLogEntry], output_path: Path):
+    def write_csv(self, entries: FlattenedLogColumns, output_path: Path):
         """Write flattened entries to CSV file."""
-        logger.info(f"Writing {len(entries)} entries to {output_path}")
+        self.write_batches([entries], output_path)
+    
+    def write_batches(self, batches, output_path: Path) -> int:
+        """Stream batches of flattened entries into one output file; return the number of entries.
         
-        # Get all field names from the dataclass
-        field_names = [field.name for field in fields(FlattenedLogEntry)]
+        A .parquet output path is written as Snappy-compressed Parquet (requires pyarrow);
+        anything else is CSV, written with one precomputed format string per row in the same
+        format as csv.DictWriter. Each batch is converted to columns as it arrives. The file
+        is only created once the first non-empty batch arrives.
+        """
+        logger.info(f"Writing entries to {output_path}")
+        
+        entry_count = 0
+        writer = None
+        try:
+            for entries in batches:
+                if not entries:
+                    continue
+                if writer is None:
+                    writer = _open_output_writer(output_path)
+                writer.write(self._to_columns(entries))
+                entry_count += len(entries)
+        finally:
+            if writer is not None:
+                writer.close()
         
-        with open(output_path, 'w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=field_names)
-            writer.writeheader()
+        logger.info(f"Wrote {entry_count} entries to {output_path}")
+        return entry_count
+    
+    def _to_columns(self, entries: FlattenedLogColumns) -> Dict[str, List[Any]]:
+        """Convert entries into CSV-ready columns keyed by field name, in field order.
+        
+        The display rules (explanations default to "na", pitch lists sorted ascending) are
+        applied per column; all other columns are passed through as stored.
+        """
+        explanation_fields = {'match_explanation', 'no_match_explanation', 
+                              'decision_explanation', 'timing_explanation', 'ornament_explanation'}
+        pitch_list_fields = {
+            'cevent_pitches_str', 'cell_used_pitches', 'dp_used_pitches',
+            'ornament_trill_pitches', 'ornament_grace_pitches', 'ornament_ignore_pitches',
+            'ornament_trill_pitches_str', 'ornament_grace_pitches_str', 'ornament_ignore_pitches_str'
+        }
+        
+        columns = {}
+        for name, column in entries.columns.items():
             
-            # Write with progress bar for large datasets
-            with tqdm(entries, desc="Writing CSV", unit="entries", 
-                     bar_format="{l_bar}{bar}| {n_fmt}/{total_fmt} [{elapsed}<{remaining}, {rate_fmt}]") as pbar:
-                for entry in pbar:
-                    # Convert dataclass to dict
-                    row_dict = {field.name: getattr(entry, field.name) for field in fields(entry)}
-                    
-                    # Replace empty explanation fields with "na"
-                    explanation_fields = ['match_explanation', 'no_match_explanation', 
-                                        'decision_explanation', 'timing_explanation', 'ornament_explanation']
-                    for field in explanation_fields:
-                        if field in row_dict and (row_dict[field] is None or row_dict[field] == ''):
-                            row_dict[field] = 'na'
-                        elif field in row_dict and row_dict[field] != 'na':
-                            # Sort pitch lists within explanation text (e.g., "Expected: [70,74,78]")
-                            row_dict[field] = self._sort_pitch_lists_in_text(str(row_dict[field]))
-                    
-                    # Sort pitch lists in ascending order
-                    pitch_list_fields = [
-                        'cevent_pitches_str', 'cell_used_pitches', 'dp_used_pitches',
-                        'ornament_trill_pitches', 'ornament_grace_pitches', 'ornament_ignore_pitches',
-                        'ornament_trill_pitches_str', 'ornament_grace_pitches_str', 'ornament_ignore_pitches_str'
-                    ]
-                    for field in pitch_list_fields:
-                        if field in row_dict and row_dict[field]:
-                            row_dict[field] = self._sort_pitch_list_string(str(row_dict[field]))
-                    
-                    writer.writerow(row_dict)
-        
-        logger.info(f"CSV file written successfully")
+            if name in explanation_fields:
+                # Replace empty explanations with "na", sort pitch lists within the text
+                # (e.g., "Expected: [70,74,78]")
+                column = ['na' if value is None or value == '' else
+                          value if value == 'na' else
+                          self._sort_pitch_lists_in_text(str(value))
+                          for value in column]
+            elif name in pitch_list_fields:
+                # Sort pitch lists in ascending order
+                column = [self._sort_pitch_list_string(str(value)) if value else value
+                          for value in column]
+            
+            columns[name] = column
+        
+        return columns
     
     def _sort_pitch_list_string(self, pitch_str: str) -> str:
         """Parse and sort a pitch list string like '[60,64,67]' or '60,64,67'."""
@@ -662,9 +980,9 @@ class LogFlattener:
             
             # Return in same format as input (with or without brackets)
             if pitch_str.strip().startswith('['):
-                return '[' + ','.join(map(str, sorted_pitches)) + ']'
+                return '[' + join_pitches(sorted_pitches) + ']'
             else:
-                return ','.join(map(str, sorted_pitches))
+                return join_pitches(sorted_pitches)
                 
         except (ValueError, AttributeError):
             # If parsing fails, return original string
@@ -674,8 +992,6 @@ class LogFlattener:
         """Sort pitch lists within explanation text like 'Expected: [70,74,78,82,58,62,66]'."""
         if not text or text == 'na':
             return text
-            
-        import re
         
         # Find all pitch list patterns like [70,74,78] or [70, 74, 78]
         def sort_match(match):
@@ -683,62 +999,265 @@ class LogFlattener:
             return self._sort_pitch_list_string(pitch_list)
         
         # Replace all pitch list patterns with sorted versions
-        # Pattern matches [digits,digits,digits] with optional spaces
-        pattern = r'\[[\d,\s]+\]'
-        sorted_text = re.sub(pattern, sort_match, text)
+        sorted_text = _PITCH_LIST_IN_TEXT.sub(sort_match, text)
         
         return sorted_text
     
-    def analyze_patterns(self, entries: List[FlattenedLogEntry]) -> Dict[str, Any]:
-        """Analyze patterns in the flattened data."""
-        analysis = {
-            'total_entries': len(entries),
-            'result_types': defaultdict(int),
-            'match_types': defaultdict(int),
-            'timing_bugs': 0,
-            'timing_failures': 0,
-            'score_competition': defaultdict(int),
-            'ornament_issues': defaultdict(int)
-        }
+    def analyze_patterns(self, entries: FlattenedLogColumns,
+                         analysis: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Analyze patterns in the flattened data.
         
-        for entry in entries:
+        Pass the analysis returned for earlier batches to accumulate counts across batches.
+        """
+        if analysis is None:
+            analysis = {
+                'total_entries': 0,
+                'result_types': defaultdict(int),
+                'match_types': defaultdict(int),
+                'timing_bugs': 0,
+                'timing_failures': 0,
+                'score_competition': defaultdict(int),
+                'ornament_issues': defaultdict(int)
+            }
+        analysis['total_entries'] += len(entries)
+        
+        columns = entries.columns
+        for (result_type, hrule_match_type, bug_has_timing_bug, timing_pass, hrule_timing_pass,
+             score_beats_top, cevent_ornament_count) in zip(
+                columns['result_type'], columns['hrule_match_type'], columns['bug_has_timing_bug'],
+                columns['timing_pass'], columns['hrule_timing_pass'], columns['score_beats_top'],
+                columns['cevent_ornament_count']):
             # Result type distribution
-            result_type = entry.result_type or "unprocessed"
-            analysis['result_types'][result_type] += 1
+            analysis['result_types'][result_type or "unprocessed"] += 1
             
             # Match type distribution
-            if entry.hrule_match_type:
-                analysis['match_types'][entry.hrule_match_type] += 1
+            if hrule_match_type:
+                analysis['match_types'][hrule_match_type] += 1
             
             # Algorithm bugs
-            if entry.bug_has_timing_bug:
+            if bug_has_timing_bug:
                 analysis['timing_bugs'] += 1
             
             # Timing failures
-            if entry.timing_pass == "nil" or entry.hrule_timing_pass == "nil":
+            if timing_pass == "nil" or hrule_timing_pass == "nil":
                 analysis['timing_failures'] += 1
             
             # Score competition
-            if entry.score_beats_top == "t":
+            if score_beats_top == "t":
                 analysis['score_competition']['beats_top'] += 1
-            elif entry.score_beats_top == "nil":
+            elif score_beats_top == "nil":
                 analysis['score_competition']['below_top'] += 1
             
             # Ornament issues
-            if entry.cevent_ornament_count > 0:
+            if cevent_ornament_count > 0:
                 analysis['ornament_issues']['has_ornaments'] += 1
-                if entry.result_type == "no_match":
+                if result_type == "no_match":
                     analysis['ornament_issues']['ornament_no_match'] += 1
         
         return analysis
 
 
+def _quote_csv_field(value: str) -> str:
+    """Quote a text field the way csv.writer does with QUOTE_MINIMAL."""
+    if '"' in value:
+        return '"' + value.replace('"', '""') + '"'
+    if ',' in value or '\n' in value or '\r' in value:
+        return '"' + value + '"'
+    return value
+
+
+class _FormattedCSVWriter:
+    """Streams column batches as CSV rows with one str.format() call per row.
+    
+    Produces the same bytes as csv.writer: text columns are quoted up front, every other
+    value goes through str(), and rows end in \\r\\n. Rows are joined and encoded in
+    batches of _CSV_BATCH_ROWS into a 1 MB buffered binary file, so there is one write
+    and one encode per batch.
+    """
+    
+    def __init__(self, output_path: Path):
+        self.csvfile = open(output_path, 'wb', buffering=_CSV_BUFFER_BYTES)
+        self.row_format = None
+    
+    def write(self, columns: Dict[str, List[Any]]):
+        if self.row_format is None:
+            self.row_format = ','.join(['{}'] * len(columns)) + '\r\n'
+            self.csvfile.write((','.join(columns) + '\r\n').encode('utf-8'))
+        rows = starmap(self.row_format.format, zip(*(
+            map(_quote_csv_field, column) if name in _TEXT_FIELDS else column
+            for name, column in columns.items()
+        )))
+        while True:
+            batch = ''.join(islice(rows, _CSV_BATCH_ROWS))
+            if not batch:
+                return
+            self.csvfile.write(batch.encode('utf-8'))
+    
+    def close(self):
+        self.csvfile.close()
+
+
+class _ParquetWriter:
+    """Streams column batches into a Snappy-compressed Parquet file.
+    
+    The schema comes from the FlattenedLogEntry type hints, so every batch is written with
+    the same column types. Batches are buffered into row groups of PARQUET_ROW_GROUP_ROWS.
+    """
+    
+    PARQUET_ROW_GROUP_ROWS = 100_000
+    ARROW_TYPES = {int: 'int64', float: 'float64', str: 'string', bool: 'bool'}
+    
+    def __init__(self, output_path: Path):
+        self.schema = pa.schema([(field.name, self.ARROW_TYPES[field.type]) for field in fields(FlattenedLogEntry)])
+        self.writer = pa_parquet.ParquetWriter(str(output_path), self.schema, compression='snappy')
+        self.pending_tables = []
+        self.pending_rows = 0
+    
+    def write(self, columns: Dict[str, List[Any]]):
+        table = pa.Table.from_pydict(columns, schema=self.schema)
+        self.pending_tables.append(table)
+        self.pending_rows += table.num_rows
+        if self.pending_rows >= self.PARQUET_ROW_GROUP_ROWS:
+            self.flush()
+    
+    def flush(self):
+        if self.pending_tables:
+            self.writer.write_table(pa.concat_tables(self.pending_tables), row_group_size=self.PARQUET_ROW_GROUP_ROWS)
+            self.pending_tables = []
+            self.pending_rows = 0
+    
+    def close(self):
+        self.flush()
+        self.writer.close()
+
+
+def _open_output_writer(output_path: Path):
+    """Return the batch writer for the output format.
+    
+    CSV always goes through _FormattedCSVWriter, so the bytes written never depend on which
+    optional packages are installed.
+    """
+    if Path(output_path).suffix == '.parquet':
+        if pa is None:
+            error_msg = f"Writing {output_path} requires pyarrow (see requirements.txt)"
+            log_with_line(logger, logging.ERROR, error_msg)
+            raise ImportError(error_msg)
+        return _ParquetWriter(output_path)
+    return _FormattedCSVWriter(output_path)
+
+
+def _iter_mmap_lines(log_file_path: Path, start: int = 0, end: Optional[int] = None):
+    """Yield (line, size_in_bytes) for each line of the log file's byte range [start, end).
+    
+    Lines are located with mmap.find() on a read-only memory map and sliced out as raw bytes,
+    so the kernel pages the file in and no per-line decode is done. The size includes the line
+    terminator, for byte-based progress reporting.
+    """
+    with open(log_file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            if end is None:
+                end = len(mm)
+            pos = start
+            while pos < end:
+                newline = mm.find(b'\n', pos, end)
+                if newline == -1:
+                    newline = end
+                yield mm[pos:newline], min(newline + 1, end) - pos
+                pos = newline + 1
+
+
+def _split_at_input_boundaries(log_file_path: Path, chunks: int):
+    """Split a log file into at most `chunks` byte ranges that each start on an INPUT| line.
+    
+    Returns a list of (start, end, first_line_num) tuples covering the whole file.
+    """
+    file_size = Path(log_file_path).stat().st_size
+    if file_size == 0:
+        return [(0, 0, 1)]
+    
+    with open(log_file_path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            boundaries = [0]
+            for i in range(1, chunks):
+                target = max(file_size * i // chunks, boundaries[-1])
+                found = mm.find(b'\nINPUT|', target)
+                if found == -1:
+                    break
+                if found + 1 > boundaries[-1]:
+                    boundaries.append(found + 1)
+            boundaries.append(file_size)
+            
+            ranges = []
+            first_line_num = 1
+            for start, end in zip(boundaries, boundaries[1:]):
+                ranges.append((start, end, first_line_num))
+                first_line_num += _count_newlines(mm, start, end)
+            return ranges
+
+
+def _count_newlines(mm, start: int, end: int, window: int = 1 << 24) -> int:
+    """Count newlines in mm[start:end] without copying the whole range at once."""
+    count = 0
+    for pos in range(start, end, window):
+        count += mm[pos:min(pos + window, end)].count(b'\n')
+    return count
+
+
+class _QueueProgress:
+    """tqdm stand-in for worker processes: forwards parsed byte counts to the parent's queue."""
+    
+    FLUSH_BYTES = 1 << 20
+    
+    def __init__(self, progress_queue):
+        self.progress_queue = progress_queue
+        self.pending_bytes = 0
+    
+    def update(self, n: int):
+        self.pending_bytes += n
+        if self.pending_bytes >= self.FLUSH_BYTES:
+            self.flush()
+    
+    def set_description(self, desc: str):
+        pass
+    
+    def flush(self):
+        if self.pending_bytes:
+            self.progress_queue.put(self.pending_bytes)
+            self.pending_bytes = 0
+
+
+def _drain_progress(progress_queue, pbar: tqdm):
+    """Apply every byte count the workers have reported so far to the progress bar."""
+    while True:
+        try:
+            pbar.update(progress_queue.get_nowait())
+        except queue.Empty:
+            return
+
+
+def _parse_log_range(log_file_path: Path, start: int, end: int, first_line_num: int, progress_queue=None):
+    """Worker entry point for parse_log_file_parallel: returns (entries, line_counts) for one byte range."""
+    flattener = LogFlattener()
+    progress = _QueueProgress(progress_queue) if progress_queue is not None else None
+    entries = flattener.parse_log_range(log_file_path, start, end, first_line_num, progress)
+    if progress is not None:
+        progress.flush()
+    return entries, flattener.line_counts
+
+
 def main():
     """Main entry point for log flattening."""
     parser = argparse.ArgumentParser(description="Flatten score following debug logs to CSV")
     parser.add_argument("log_file", help="Path to debug log file")
-    parser.add_argument("--output", "-o", help="Output CSV file path (default: same as log file with .csv extension)")
+    parser.add_argument("--output", "-o", help="Output CSV file path, or a .parquet path for Parquet output "
+                                               "(default: same as log file with .csv extension)")
     parser.add_argument("--analyze", "-a", action="store_true", help="Print pattern analysis")
+    parser.add_argument("--workers", "-j", type=positive_int, nargs="?", const=None, default=1,
+                        help="Parse with N worker processes (-j alone = one per CPU core, default: 1)")
     parser.add_argument("--verbose", "-v", action="store_true", help="Verbose logging")
     
     args = parser.parse_args()
@@ -754,21 +1273,32 @@ def main():
     
     output_file = Path(args.output) if args.output else log_file.with_suffix('.csv')
     
-    # Create flattener and process
+    # Create flattener and stream entries straight into the output file, batch by batch
     flattener = LogFlattener()
-    entries = flattener.parse_log_file(log_file)
+    if args.workers == 1:
+        batches = flattener.iter_entries(log_file)
+    else:
+        batches = flattener.iter_entries_parallel(log_file, workers=args.workers)
+    
+    # Fold the optional analysis into the same pass so no entries are retained
+    analysis = None
+    if args.analyze:
+        def analyzed(batches):
+            nonlocal analysis
+            for entries in batches:
+                analysis = flattener.analyze_patterns(entries, analysis)
+                yield entries
+        batches = analyzed(batches)
+    
+    entry_count = flattener.write_batches(batches, output_file)
     
-    if not entries:
+    if not entry_count:
         error_msg = f"No entries found in log file: {log_file}"
         log_with_line(logger, logging.ERROR, error_msg, context=f"file_size={log_file.stat().st_size if log_file.exists() else 'N/A'}")
         raise RuntimeError(error_msg)
     
-    # Write CSV
-    flattener.write_csv(entries, output_file)
-    
     # Optional analysis
     if args.analyze:
-        analysis = flattener.analyze_patterns(entries)
         print("\nPattern Analysis:")
         print("="*50)
         for category, data in analysis.items():
@@ -780,7 +1310,7 @@ def main():
                 print(f"  {data}")
         print()
     
-    print(f"Successfully flattened {len(entries)} log entries to {output_file}")
+    print(f"Successfully flattened {entry_count} log entries to {output_file}")
     return 0
 
 
@@ -4,26 +4,98 @@ Test runner for score following debug system.
 Executes Serpent tests with timeout and captures debug logs.
 """
 
+import io
 import os
 import sys
+import codecs
+import asyncio
+import locale
 import argparse
 import subprocess
-import signal
+import shutil
+import tempfile
 import time
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, Tuple, Dict, Any
+from typing import Optional, Tuple, Dict, Any, List, IO, Iterable, Iterator
 
+import config
 from config import (
     SERPENT_SRC_DIR, LOGS_DIR, SERPENT_EXECUTABLE, TEST_SCRIPT, TEST_TIMEOUT,
     get_log_filename
 )
-from utils import setup_logging, get_timestamp, format_duration, log_with_line
+from utils import setup_logging, get_timestamp, format_duration, log_with_line, positive_int
 import logging
 
 
 logger = setup_logging(__name__)
 
+# Write buffer for execution logs, also the chunk size for copying Serpent debug output
+_LOG_BUFFER_BYTES = 1 << 20
+
+
+def _decode_output(data: bytes) -> str:
+    """Decode captured child output the way subprocess text mode does (locale encoding, universal newlines)."""
+    text = data.decode(locale.getpreferredencoding(False))
+    return text.replace('\r\n', '\n').replace('\r', '\n')
+
+
+def _iter_decoded(output_file: IO[bytes]) -> Iterator[str]:
+    """Decode a file of captured child output chunk by chunk, as _decode_output() would decode it whole."""
+    decoder = io.IncrementalNewlineDecoder(
+        codecs.getincrementaldecoder(locale.getpreferredencoding(False))(), translate=True
+    )
+    output_file.seek(0)
+    for chunk in iter(lambda: output_file.read(_LOG_BUFFER_BYTES), b''):
+        yield decoder.decode(chunk)
+    yield decoder.decode(b'', final=True)
+
+
+async def _kill_with_escalation(process: asyncio.subprocess.Process, grace: float) -> None:
+    """Send SIGTERM, then SIGKILL if the process has not exited within grace seconds, and reap it.
+    
+    Polls the exit status every 10ms rather than sleeping a fixed interval, so a process that
+    exits promptly is not held for the whole grace period.
+    """
+    process.terminate()
+    deadline = time.monotonic() + grace
+    while process.returncode is None and time.monotonic() < deadline:
+        await asyncio.sleep(0.01)
+    if process.returncode is None:
+        logger.info(f"Process still running {grace}s after SIGTERM, killing...")
+        process.kill()
+    # Reap the child so no zombie is left behind
+    await process.wait()
+
+
+def _append_file_bytes(src: IO[bytes], dst: IO[str], size: int) -> None:
+    """Append the first size bytes of src to the text file dst, zero-copy via sendfile(2) on Linux."""
+    dst.flush()
+    if not sys.platform.startswith('linux'):
+        # sendfile() elsewhere is missing or only writes to sockets
+        shutil.copyfileobj(src, dst.buffer, _LOG_BUFFER_BYTES)
+        return
+    offset = 0
+    while offset < size:
+        sent = os.sendfile(dst.fileno(), src.fileno(), offset, size - offset)
+        if not sent:
+            # The source ended early (e.g. truncated while copying); don't save a silently cut-off log
+            error_msg = f"Copied only {offset} of {size} expected bytes from {src.name} to {dst.name}"
+            log_with_line(logger, logging.ERROR, error_msg)
+            raise OSError(error_msg)
+        offset += sent
+
+
+def _count_lines(chunks: Iterable[str]) -> int:
+    """Count lines like len(''.join(chunks).splitlines()) for decoded output, without building the list."""
+    count = 0
+    last_chunk = ''
+    for chunk in chunks:
+        if chunk:
+            count += chunk.count('\n')
+            last_chunk = chunk
+    return count + (bool(last_chunk) and not last_chunk.endswith('\n'))
+
 
 class TestExecutor:
     """Handles execution of Serpent tests with timeout and logging."""
@@ -39,6 +111,15 @@ class TestExecutor:
         """
         Execute the test with timeout and capture results.
         
+        Returns:
+            Dict containing execution results and metadata
+        """
+        return asyncio.run(self.run_test_async())
+    
+    async def run_test_async(self) -> Dict[str, Any]:
+        """
+        Coroutine form of run_test(), so many test cases can share one event loop.
+        
         Returns:
             Dict containing execution results and metadata
         """
@@ -51,30 +132,40 @@ class TestExecutor:
         # Prepare environment
         env = self._prepare_environment()
         
-        # Execute with timeout
-        start_time = datetime.now()
-        result = self._execute_with_timeout(cmd, env)
-        end_time = datetime.now()
-        
-        # Compile results
-        execution_result = {
-            'test_case_id': self.test_case_id,
-            'timestamp': self.timestamp,
-            'start_time': start_time.isoformat(),
-            'end_time': end_time.isoformat(),
-            'duration_seconds': (end_time - start_time).total_seconds(),
-            'command': ' '.join(cmd),
-            'log_file': str(self.log_file),
-            'success': result['returncode'] == 0 or result['timeout'],
-            'timeout': result['timeout'],
-            'returncode': result['returncode'],
-            'stdout_lines': len(result['stdout'].splitlines()) if result['stdout'] else 0,
-            'stderr_lines': len(result['stderr'].splitlines()) if result['stderr'] else 0,
-            'debug_enabled': self.enable_debug
-        }
-        
-        # Save execution logs
-        self._save_execution_logs(result, execution_result)
+        # Child stdout goes straight to an unnamed file next to the logs rather than through Python memory
+        with tempfile.TemporaryFile(dir=LOGS_DIR) as stdout_file:
+            # Execute with timeout
+            start_time = datetime.now()
+            start_ns = time.perf_counter_ns()
+            result = await self._execute_with_timeout(cmd, env, stdout_file)
+            duration_ns = time.perf_counter_ns() - start_ns
+            end_time = datetime.now()
+            
+            # Decoding the captured output and writing the log is blocking file I/O; run it on a
+            # worker thread (as asyncio.to_thread does on 3.9+) so other cases in a --cases batch
+            # keep being serviced
+            loop = asyncio.get_running_loop()
+            stdout_lines = await loop.run_in_executor(None, _count_lines, _iter_decoded(stdout_file))
+            
+            # Compile results
+            execution_result = {
+                'test_case_id': self.test_case_id,
+                'timestamp': self.timestamp,
+                'start_time': start_time.isoformat(),
+                'end_time': end_time.isoformat(),
+                'duration_seconds': duration_ns / 1e9,
+                'command': ' '.join(cmd),
+                'log_file': str(self.log_file),
+                'success': result['returncode'] == 0 or result['timeout'],
+                'timeout': result['timeout'],
+                'returncode': result['returncode'],
+                'stdout_lines': stdout_lines,
+                'stderr_lines': _count_lines([result['stderr']]),
+                'debug_enabled': self.enable_debug
+            }
+            
+            # Save execution logs
+            await loop.run_in_executor(None, self._save_execution_logs, result, execution_result)
         
         logger.info(f"Test completed in {format_duration(execution_result['duration_seconds'])}")
         
@@ -106,126 +197,103 @@ class TestExecutor:
         
         return env
     
-    def _execute_with_timeout(self, cmd: list, env: dict) -> Dict[str, Any]:
-        """Execute command with timeout handling."""
+    async def _execute_with_timeout(self, cmd: list, env: dict, stdout_file: IO[bytes]) -> Dict[str, Any]:
+        """Execute command with timeout handling, writing the child's stdout to stdout_file."""
         try:
-            # Change to source directory
-            original_cwd = os.getcwd()
-            os.chdir(SERPENT_SRC_DIR)
-            
             logger.info(f"Working directory: {SERPENT_SRC_DIR}")
-            logger.info(f"Timeout: {TEST_TIMEOUT} seconds")
+            logger.info(f"Timeout: {config.TEST_TIMEOUT} seconds")
             log_with_line(logger, logging.INFO, f"Executing command: {' '.join(cmd)}", context=f"working_dir={SERPENT_SRC_DIR}")
             
-            # Start process
-            self.process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                env=env,
-                creationflags=subprocess.CREATE_NEW_PROCESS_GROUP if os.name == 'nt' else 0
-            )
-            
-            # Wait with timeout
-            try:
-                stdout, stderr = self.process.communicate(timeout=TEST_TIMEOUT)
-                timeout = False
-                returncode = self.process.returncode
-                
-            except subprocess.TimeoutExpired:
-                logger.info(f"Test timed out after {TEST_TIMEOUT} seconds, terminating...")
-                
-                # Terminate process
-                if os.name == 'nt':
-                    # Windows
-                    self.process.terminate()
-                else:
-                    # Unix-like
-                    self.process.terminate()
-                
-                # Give it a moment to terminate gracefully
-                time.sleep(1)
+            # Start process in the source directory (cwd= rather than os.chdir, so concurrent runs don't race).
+            # stderr also goes to a file: with no pipes to the child, wait() returns as soon as the
+            # process exits, even if an orphaned grandchild outlives it, and partial output survives a timeout.
+            with tempfile.TemporaryFile(dir=LOGS_DIR) as stderr_file:
+                self.process = await asyncio.create_subprocess_exec(
+                    *cmd,
+                    stdout=stdout_file,
+                    stderr=stderr_file,
+                    env=env,
+                    cwd=SERPENT_SRC_DIR,
+                    creationflags=subprocess.CREATE_NEW_PROCESS_GROUP if os.name == 'nt' else 0
+                )
                 
-                # Force kill if still running
-                if self.process.poll() is None:
-                    if os.name == 'nt':
-                        self.process.kill()
-                    else:
-                        os.kill(self.process.pid, signal.SIGKILL)
-                
-                # Get partial output
+                # Wait with timeout
                 try:
-                    stdout, stderr = self.process.communicate(timeout=2)
-                except subprocess.TimeoutExpired:
-                    stdout, stderr = "", ""
-                
-                timeout = True
-                returncode = -1
+                    await asyncio.wait_for(self.process.wait(), timeout=config.TEST_TIMEOUT)
+                    timeout = False
+                    returncode = self.process.returncode
+                    
+                except asyncio.TimeoutError:
+                    logger.info(f"Test timed out after {config.TEST_TIMEOUT} seconds, terminating...")
+                    await _kill_with_escalation(self.process, config.GRACE_SECONDS)
+                    
+                    timeout = True
+                    returncode = -1
                 
+                # Get (possibly partial) stderr; stdout is already on disk
+                stderr_file.seek(0)
+                stderr = stderr_file.read()
+            
             return {
-                'stdout': stdout,
-                'stderr': stderr,
+                'stdout_file': stdout_file,
+                'stderr': _decode_output(stderr),
                 'returncode': returncode,
                 'timeout': timeout
             }
             
         finally:
-            # Restore working directory
-            os.chdir(original_cwd)
             self.process = None
     
     def _save_execution_logs(self, result: Dict[str, Any], metadata: Dict[str, Any]):
         """Save execution logs and metadata."""
         # Create log file with metadata header
-        with open(self.log_file, 'w', encoding='utf-8') as f:
-            f.write("# Score Following Debug Log\n")
-            f.write(f"# Test Case: {self.test_case_id}\n")
-            f.write(f"# Timestamp: {self.timestamp}\n")
-            f.write(f"# Command: {metadata['command']}\n")
-            f.write(f"# Working Dir: {SERPENT_SRC_DIR}\n")
-            f.write(f"# Duration: {format_duration(metadata['duration_seconds'])}\n")
-            f.write(f"# Timeout: {result['timeout']}\n")
-            f.write(f"# Return Code: {result['returncode']}\n")
-            f.write("#" + "="*50 + "\n\n")
-            
-            # Add test start marker
-            f.write(f"TEST_START|test_case:{self.test_case_id}|score_file:unknown|performance_file:unknown\n")
+        with open(self.log_file, 'w', encoding='utf-8', buffering=_LOG_BUFFER_BYTES) as f:
+            f.write(
+                "# Score Following Debug Log\n"
+                f"# Test Case: {self.test_case_id}\n"
+                f"# Timestamp: {self.timestamp}\n"
+                f"# Command: {metadata['command']}\n"
+                f"# Working Dir: {SERPENT_SRC_DIR}\n"
+                f"# Duration: {format_duration(metadata['duration_seconds'])}\n"
+                f"# Timeout: {result['timeout']}\n"
+                f"# Return Code: {result['returncode']}\n"
+                "#" + "="*50 + "\n\n"
+                # Add test start marker
+                f"TEST_START|test_case:{self.test_case_id}|score_file:unknown|performance_file:unknown\n"
+            )
             
             # Check if there's a separate debug file from Serpent
             debug_file_env = str(self.log_file)
             serpent_debug_file = debug_file_env.replace('.log', '_serpent.log')
             
-            # First, try to read the Serpent debug file if it exists
-            serpent_debug_content = ""
+            # Copy the Serpent debug output first (if any) file-to-file, without decoding it
             if Path(serpent_debug_file).exists():
                 try:
-                    with open(serpent_debug_file, 'r', encoding='utf-8') as debug_f:
-                        serpent_debug_content = debug_f.read()
+                    with open(serpent_debug_file, 'rb') as debug_f:
+                        size = os.fstat(debug_f.fileno()).st_size
+                        if size:
+                            f.write("# SERPENT DEBUG OUTPUT:\n")
+                            _append_file_bytes(debug_f, f, size)
+                            f.write("\n")
                     logger.info(f"Found Serpent debug file: {serpent_debug_file}")
                 except Exception as e:
                     logger.warning(f"Could not read Serpent debug file: {e}")
             
-            # Write Serpent debug output first (if any)
-            if serpent_debug_content:
-                f.write("# SERPENT DEBUG OUTPUT:\n")
-                f.write(serpent_debug_content)
-                f.write("\n")
-            
-            # Write stdout (console output)
-            if result['stdout']:
+            # Copy stdout (console output) from its capture file
+            stdout_file = result['stdout_file']
+            if stdout_file.seek(0, os.SEEK_END):
                 f.write("# STDOUT:\n")
-                f.write(result['stdout'])
+                f.writelines(_iter_decoded(stdout_file))
                 f.write("\n")
             
+            parts = []
             # Write stderr if any
             if result['stderr']:
-                f.write("# STDERR:\n")
-                f.write(result['stderr'])
-                f.write("\n")
+                parts += ["# STDERR:\n", result['stderr'], "\n"]
             
             # Add test end marker
-            f.write(f"TEST_END|test_case:{self.test_case_id}|matches_found:unknown|total_notes:unknown\n")
+            parts.append(f"TEST_END|test_case:{self.test_case_id}|matches_found:unknown|total_notes:unknown\n")
+            f.write(''.join(parts))
         
         logger.info(f"Debug log saved to: {self.log_file}")
         
@@ -239,28 +307,105 @@ class TestExecutor:
     
     def cleanup(self):
         """Clean up resources."""
-        if self.process and self.process.poll() is None:
+        if self.process and self.process.returncode is None:
             logger.warning("Cleaning up running process")
             self.process.terminate()
 
 
+def parse_case_ids(spec: str) -> List[int]:
+    """Parse a test case list such as '1-50', '1,3,5' or '1-5,9' into sorted unique IDs."""
+    ids = set()
+    for part in spec.split(','):
+        first, _, last = part.strip().partition('-')
+        if not first.isdigit() or (last and not last.isdigit()):
+            raise argparse.ArgumentTypeError(f"Invalid test case list entry: {part!r} (expected N or N-M)")
+        last = last or first
+        if int(last) < int(first):
+            raise argparse.ArgumentTypeError(f"Invalid test case range: {part!r} (end before start)")
+        ids.update(range(int(first), int(last) + 1))
+    return sorted(ids)
+
+
+async def _run_many_async(ids: List[int], workers: int, enable_debug: bool) -> Dict[int, Dict[str, Any]]:
+    """Run test cases on one event loop, at most workers Serpent processes at a time."""
+    slots = asyncio.Semaphore(workers)
+    
+    async def run_one(test_case_id: int) -> Tuple[int, Dict[str, Any]]:
+        async with slots:
+            executor = TestExecutor(test_case_id=test_case_id, enable_debug=enable_debug)
+            return test_case_id, await executor.run_test_async()
+    
+    return dict(await asyncio.gather(*(run_one(test_case_id) for test_case_id in ids)))
+
+
+def run_many(ids: List[int], workers: Optional[int] = None, enable_debug: bool = True) -> Dict[int, Dict[str, Any]]:
+    """
+    Run several test cases concurrently, each with its own timeout and log file.
+    
+    Args:
+        ids: Test case IDs to run
+        workers: Maximum concurrent test processes (default: all cores but two)
+        enable_debug: Whether to enable debug logging for each test
+        
+    Returns:
+        Dict mapping test case ID to its execution result
+    """
+    if workers is None:
+        workers = max(1, (os.cpu_count() or 1) - 2)
+    elif workers < 1:
+        error_msg = f"workers must be at least 1, got {workers}"
+        log_with_line(logger, logging.ERROR, error_msg)
+        raise ValueError(error_msg)
+    logger.info(f"Running {len(ids)} test cases ({workers} workers)")
+    return asyncio.run(_run_many_async(ids, workers, enable_debug))
+
+
+def _print_batch_summary(results: Dict[int, Dict[str, Any]]) -> None:
+    """Print one row per test case from run_many() results."""
+    print(f"\nBatch Execution Summary ({len(results)} test cases):")
+    print(f"{'Case':>6}  {'Duration':>9}  {'Success':<7}  {'Timeout':<7}  {'Return':>6}  Log File")
+    for test_case_id, result in sorted(results.items()):
+        print(f"{test_case_id:>6}  {format_duration(result['duration_seconds']):>9}  "
+              f"{str(result['success']):<7}  {str(result['timeout']):<7}  "
+              f"{result['returncode']:>6}  {result['log_file']}")
+
+
 def main():
     """Main entry point."""
     parser = argparse.ArgumentParser(description="Run score following test with debug logging")
-    parser.add_argument("test_case", type=int, help="Test case ID to run")
+    parser.add_argument("test_case", type=int, nargs="?", help="Test case ID to run")
+    parser.add_argument("--cases", type=parse_case_ids,
+                        help="Run several test cases concurrently, e.g. 1-50 or 1,3,5")
+    parser.add_argument("--workers", "-j", type=positive_int, default=None,
+                        help="Concurrent test processes with --cases (default: all cores but two)")
     parser.add_argument("--no-debug", action="store_true", help="Disable debug logging")
     parser.add_argument("--timeout", type=int, default=TEST_TIMEOUT, help="Timeout in seconds")
+    parser.add_argument("--sigterm-timeout", type=float, default=config.GRACE_SECONDS,
+                        help="Seconds to wait after SIGTERM before SIGKILL on timeout")
     parser.add_argument("--verbose", "-v", action="store_true", help="Verbose output")
     
     args = parser.parse_args()
+    if (args.test_case is None) == (args.cases is None):
+        parser.error("give either a test case ID or --cases")
     
     if args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
     
-    # Update timeout if specified  
-    import config
+    # Update timeouts if specified  
     if args.timeout != TEST_TIMEOUT:
         config.TEST_TIMEOUT = args.timeout
+    config.GRACE_SECONDS = args.sigterm_timeout
+    
+    if args.cases is not None:
+        try:
+            results = run_many(args.cases, workers=args.workers, enable_debug=not args.no_debug)
+        except KeyboardInterrupt:
+            logger.info("Interrupted by user")
+            sys.exit(1)
+        _print_batch_summary(results)
+        if any(not result['success'] and not result['timeout'] for result in results.values()):
+            sys.exit(1)
+        return
     
     # Create executor
     executor = TestExecutor(
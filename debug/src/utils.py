@@ -2,16 +2,64 @@
 Utility functions for the score following debug system.
 """
 
+import io
+import os
+import argparse
 import re
 import json
+import mmap
+import sys
+import time
 import logging
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, Iterator, List, Any, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # Optional accelerator, see requirements.txt
+    np = None
 
 from config import LOG_PATTERNS, LOGS_DIR
 
 
+# Log types in rough order of how often they occur in a run (several per DP cell). Every
+# pattern starts with its own record prefix, so trying them in this order instead of the
+# LOG_PATTERNS order does not change which pattern matches a line.
+_FREQUENT_LOG_TYPES = (
+    'dp_entry', 'cell_state', 'vertical_rule', 'horizontal_rule', 'timing_check',
+    'match_type', 'cell_decision', 'score_competition', 'ornament_processing',
+    'array_neighborhood', 'cevent_summary'
+)
+_PATTERN_ORDER = _FREQUENT_LOG_TYPES + tuple(name for name in LOG_PATTERNS if name not in _FREQUENT_LOG_TYPES)
+
+
+def _compile_combined_pattern(pattern_names) -> Tuple[re.Pattern, Dict[str, Tuple[int, int]]]:
+    """Compile the patterns into one alternation of named groups.
+    
+    Returns the compiled pattern and, per log type, the (start, end) slice of its own
+    groups within match.groups(). The named group of the matching branch is the last to
+    close, so match.lastgroup is the log type.
+    """
+    branches = []
+    group_slices = {}
+    group_index = 0
+    for name in pattern_names:
+        pattern = LOG_PATTERNS[name]
+        group_count = re.compile(pattern).groups
+        # Skip the named group itself; its pattern's groups follow it
+        group_slices[name] = (group_index + 1, group_index + 1 + group_count)
+        group_index += 1 + group_count
+        branches.append(f"(?P<{name}>{pattern})")
+    return re.compile('|'.join(branches), re.ASCII), group_slices
+
+
+_COMBINED_PATTERN, _GROUP_SLICES = _compile_combined_pattern(_PATTERN_ORDER)
+
+
 def setup_logging(name: str, level: int = logging.INFO) -> logging.Logger:
     """Set up logging for debug modules."""
     logger = logging.getLogger(name)
@@ -28,17 +76,24 @@ def setup_logging(name: str, level: int = logging.INFO) -> logging.Logger:
     return logger
 
 
+@lru_cache(maxsize=256)
+def _source_name(filename: str) -> str:
+    """Base name of a code object's source file (stable per code object, so cached)."""
+    return Path(filename).name
+
+
 def log_with_line(logger: logging.Logger, level: int, message: str, line_number: Optional[int] = None, context: Optional[str] = None) -> None:
     """Enhanced logging with line number and context for better debugging."""
-    import inspect
+    # Skip frame lookup and formatting entirely when the level is filtered out
+    if not logger.isEnabledFor(level):
+        return
     
     # Get caller information if line_number not provided
     if line_number is None:
-        frame = inspect.currentframe().f_back
+        frame = sys._getframe(1)
         line_number = frame.f_lineno
-        filename = frame.f_code.co_filename
-        function_name = frame.f_code.co_name
-        caller_context = f"{Path(filename).name}:{function_name}:{line_number}"
+        code = frame.f_code
+        caller_context = f"{_source_name(code.co_filename)}:{code.co_name}:{line_number}"
     else:
         caller_context = f"line:{line_number}"
     
@@ -51,15 +106,23 @@ def log_with_line(logger: logging.Logger, level: int, message: str, line_number:
     logger.log(level, formatted_message)
 
 
+def _parse_number_list(text: str, convert) -> list:
+    """Convert each comma-separated item of text, skipping blank items (as from a trailing comma)."""
+    try:
+        # Fast path for well-formed lists; int() and float() already ignore surrounding spaces
+        return list(map(convert, text.split(',')))
+    except ValueError:
+        return [convert(item) for item in map(str.strip, text.split(',')) if item]
+
+
 def parse_pitch_list(pitch_str: str) -> List[int]:
     """Parse a comma-separated pitch string into a list of integers."""
     if not pitch_str.strip():
         # Empty string is valid - represents no pitches
         return []
     
-    parts = [p.strip() for p in pitch_str.split(',') if p.strip()]
     try:
-        return [int(p) for p in parts]
+        return _parse_number_list(pitch_str, int)
     except ValueError as e:
         raise ValueError(f"Invalid pitch value in string '{pitch_str}': {e}")
 
@@ -69,220 +132,398 @@ def format_time(timestamp: float) -> str:
     return f"{timestamp:.3f}"
 
 
+# Decimal strings of the MIDI pitch range, so formatting a pitch is a lookup instead of int.__str__
+_PITCH_STR = {pitch: str(pitch) for pitch in range(128)}
+
+
+def join_pitches(pitches: List[int]) -> str:
+    """Join pitches with commas ('60,64,67'), without brackets."""
+    try:
+        return ','.join(map(_PITCH_STR.__getitem__, pitches))
+    except KeyError:
+        # Outside the MIDI range
+        return ','.join(map(str, pitches))
+
+
 def format_pitches(pitches: List[int]) -> str:
     """Format a list of pitches for display."""
     if not pitches:
         return "[]"
-    return f"[{','.join(map(str, pitches))}]"
+    return f"[{join_pitches(pitches)}]"
 
 
 def find_latest_log(test_case_id: int) -> Path:
     """Find the most recent log file for a test case."""
-    pattern = f"test_{test_case_id}_*.log"
-    log_files = list(LOGS_DIR.glob(pattern))
-    
-    # Exclude temporary _serpent.log files
-    log_files = [f for f in log_files if not f.name.endswith('_serpent.log')]
+    prefix = f"test_{test_case_id}_"
+    # Keep a running maximum over one directory listing (no glob/fnmatch, no list of
+    # candidates), excluding temporary _serpent.log files
+    with os.scandir(LOGS_DIR) as entries:
+        latest = max(
+            (entry for entry in entries
+             if entry.name.startswith(prefix) and entry.name.endswith('.log')
+             and not entry.name.endswith('_serpent.log')),
+            key=lambda entry: entry.stat().st_mtime_ns,
+            default=None
+        )
     
-    if not log_files:
+    if latest is None:
         raise FileNotFoundError(f"No log files found for test case {test_case_id} in {LOGS_DIR}")
     
-    # Sort by modification time, return most recent
-    return max(log_files, key=lambda f: f.stat().st_mtime)
+    return Path(latest.path)
+
+
+def iter_log_lines(log_file: Path) -> Iterator[str]:
+    """Yield the lines of a log file one at a time, for parsing logs in bounded memory.
+    
+    The file is read once through a 1 MiB buffer. Undecodable bytes become U+FFFD instead of
+    restarting the read in another encoding, since the log patterns only match ASCII anyway.
+    """
+    with open(log_file, 'r', encoding='utf-8', errors='replace', buffering=1 << 20) as f:
+        yield from f
 
 
 def read_log_lines(log_file: Path) -> List[str]:
-    """Read lines from a log file, handling encoding issues."""
-    try:
-        with open(log_file, 'r', encoding='utf-8') as f:
-            return f.readlines()
-    except UnicodeDecodeError:
-        with open(log_file, 'r', encoding='latin-1') as f:
-            return f.readlines()
+    """Read all lines of a log file into a list.
+    
+    Decodes in a single read like iter_log_lines(), rather than retrying the whole file as
+    latin-1 after a UTF-8 error. Prefer iter_log_lines() for parsing, which keeps memory bounded.
+    """
+    return list(iter_log_lines(log_file))
+
+
+def _extract_dp_entry(line: str, groups: Tuple[str, ...]) -> Dict[str, Any]:
+    """Extract the fields of a DP| line."""
+    return {
+        'type': 'dp_entry',
+        'column': int(groups[0]),
+        'row': int(groups[1]),
+        'pitch': int(groups[2]),
+        'time': float(groups[3]),
+        'vertical_rule': float(groups[4]),
+        'horizontal_rule': float(groups[5]),
+        'final_value': float(groups[6]),
+        'match_flag': groups[7] == '1',
+        'used_pitches': parse_pitch_list(groups[8]),
+        'unused_count': int(groups[9])
+    }
+
+
+def _extract_match_found(line: str, groups: Tuple[str, ...]) -> Dict[str, Any]:
+    """Extract the fields of a MATCH| line."""
+    return {
+        'type': 'match_found',
+        'row': int(groups[0]),
+        'pitch': int(groups[1]),
+        'time': float(groups[2]),
+        'score': float(groups[3])
+    }
+
+
+def _extract_no_match(line: str, groups: Tuple[str, ...]) -> Dict[str, Any]:
+    """Extract the fields of a NO_MATCH| line."""
+    return {
+        'type': 'no_match',
+        'pitch': int(groups[0]),
+        'time': float(groups[1])
+    }
+
+
+def _extract_test_start(line: str, groups: Tuple[str, ...]) -> Dict[str, Any]:
+    """Extract the fields of a TEST_START| line."""
+    return {
+        'type': 'test_start',
+        'test_case': int(groups[0]),
+        'score_file': groups[1],
+        'performance_file': groups[2]
+    }
+
+
+def _extract_test_end(line: str, groups: Tuple[str, ...]) -> Dict[str, Any]:
+    """Extract the fields of a TEST_END| line."""
+    return {
+        'type': 'test_end',
+        'test_case': int(groups[0]),
+        'matches': int(groups[1]),
+        'total_notes': int(groups[2])
+    }
+
+
+def _extract_input_event(line: str, groups: Tuple[str, ...]) -> Dict[str, Any]:
+    """Extract the fields of an INPUT| line."""
+    return {
+        'type': 'input_event',
+        'column': int(groups[0]),
+        'pitch': int(groups[1]),
+        'time': float(groups[2])
+    }
+
+
+def _extract_matrix_state(line: str, groups: Tuple[str, ...]) -> Dict[str, Any]:
+    """Extract the fields of a MATRIX| line."""
+    return {
+        'type': 'matrix_state',
+        'column': int(groups[0]),
+        'window_start': int(groups[1]),
+        'window_end': int(groups[2]),
+        'window_center': int(groups[3]),
+        'current_base': int(groups[4]),
+        'prev_base': int(groups[5]),
+        'current_upper': int(groups[6]),
+        'prev_upper': int(groups[7])
+    }
+
+
+def _extract_cell_state(line: str, groups: Tuple[str, ...]) -> Dict[str, Any]:
+    """Extract the fields of a CELL| line."""
+    return {
+        'type': 'cell_state',
+        'row': int(groups[0]),
+        'value': float(groups[1]),
+        'used_pitches': parse_pitch_list(groups[2]),
+        'unused_count': int(groups[3]),
+        'time': float(groups[4])
+    }
+
+
+def _extract_vertical_rule(line: str, groups: Tuple[str, ...]) -> Dict[str, Any]:
+    """Extract the fields of a VRULE| line."""
+    return {
+        'type': 'vertical_rule',
+        'row': int(groups[0]),
+        'up_value': float(groups[1]),
+        'penalty': float(groups[2]),
+        'result': float(groups[3]),
+        'start_point': groups[4] == 't'
+    }
+
+
+def _extract_horizontal_rule(line: str, groups: Tuple[str, ...]) -> Dict[str, Any]:
+    """Extract the fields of a HRULE| line."""
+    return {
+        'type': 'horizontal_rule',
+        'row': int(groups[0]),
+        'prev_value': float(groups[1]),
+        'pitch': int(groups[2]),
+        'ioi': float(groups[3]),
+        'limit': float(groups[4]),
+        'timing_pass': groups[5] == 't',
+        'match_type': groups[6],
+        'result': float(groups[7])
+    }
+
+
+def _extract_timing_check(line: str, groups: Tuple[str, ...]) -> Dict[str, Any]:
+    """Extract the fields of a TIMING| line."""
+    return {
+        'type': 'timing_check',
+        'prev_time': float(groups[0]),
+        'curr_time': float(groups[1]),
+        'ioi': float(groups[2]),
+        'span': float(groups[3]),
+        'limit': float(groups[4]),
+        'timing_pass': groups[5] == 't',
+        'constraint_type': groups[6]
+    }
+
+
+def _extract_match_type(line: str, groups: Tuple[str, ...]) -> Dict[str, Any]:
+    """Extract the fields of a MATCH_TYPE| line."""
+    return {
+        'type': 'match_type',
+        'pitch': int(groups[0]),
+        'is_chord': groups[1] == 't',
+        'is_trill': groups[2] == 't',
+        'is_grace': groups[3] == 't',
+        'is_extra': groups[4] == 't',
+        'is_ignored': groups[5] == 't',
+        'already_used': groups[6] == 't',
+        'timing_ok': groups[7] == 't',
+        'ornament_info': groups[8]
+    }
+
+
+def _extract_cell_decision(line: str, groups: Tuple[str, ...]) -> Dict[str, Any]:
+    """Extract the fields of a DECISION| line."""
+    return {
+        'type': 'cell_decision',
+        'row': int(groups[0]),
+        'vertical_result': float(groups[1]),
+        'horizontal_result': float(groups[2]),
+        'winner': groups[3],
+        'updated': groups[4] == 't',
+        'final_value': float(groups[5]),
+        'reason': groups[6]
+    }
+
+
+def _extract_array_neighborhood(line: str, groups: Tuple[str, ...]) -> Dict[str, Any]:
+    """Extract the fields of an ARRAY| line."""
+    # Parse the comma-separated values
+    vals_str = groups[1]
+    neighbor_values = _parse_number_list(vals_str, float)
+    positions_str = groups[2]
+    positions = _parse_number_list(positions_str, int)
+    if not neighbor_values:
+        raise ValueError(f"Array neighborhood at line '{line}' has no neighbor values - parsing error")
+    return {
+        'type': 'array_neighborhood',
+        'row': int(groups[0]),
+        'center_value': neighbor_values[len(neighbor_values)//2],
+        'neighbor_values': neighbor_values,
+        'positions': positions
+    }
+
+
+def _extract_score_competition(line: str, groups: Tuple[str, ...]) -> Dict[str, Any]:
+    """Extract the fields of a SCORE| line."""
+    return {
+        'type': 'score_competition',
+        'row': int(groups[0]),
+        'current_score': float(groups[1]),
+        'top_score': float(groups[2]),
+        'beats_top': groups[3] == 't',
+        'margin': float(groups[4]),
+        'confidence': float(groups[5])
+    }
+
+
+def _extract_ornament_processing(line: str, groups: Tuple[str, ...]) -> Dict[str, Any]:
+    """Extract the fields of an ORNAMENT| line."""
+    return {
+        'type': 'ornament_processing',
+        'pitch': int(groups[0]),
+        'ornament_type': groups[1],
+        'trill_pitches': parse_pitch_list(groups[2]),
+        'grace_pitches': parse_pitch_list(groups[3]),
+        'ignore_pitches': parse_pitch_list(groups[4]),
+        'credit': float(groups[5])
+    }
+
+
+def _extract_window_movement(line: str, groups: Tuple[str, ...]) -> Dict[str, Any]:
+    """Extract the fields of a WINDOW_MOVE| line."""
+    return {
+        'type': 'window_movement',
+        'old_center': int(groups[0]),
+        'new_center': int(groups[1]),
+        'old_start': int(groups[2]),
+        'new_start': int(groups[3]),
+        'old_end': int(groups[4]),
+        'new_end': int(groups[5]),
+        'reason': groups[6]
+    }
+
+
+# Field extractor for each log type, keyed like LOG_PATTERNS
+_EXTRACTORS = {
+    'dp_entry': _extract_dp_entry,
+    'match_found': _extract_match_found,
+    'no_match': _extract_no_match,
+    'test_start': _extract_test_start,
+    'test_end': _extract_test_end,
+    'input_event': _extract_input_event,
+    'matrix_state': _extract_matrix_state,
+    'cell_state': _extract_cell_state,
+    'vertical_rule': _extract_vertical_rule,
+    'horizontal_rule': _extract_horizontal_rule,
+    'timing_check': _extract_timing_check,
+    'match_type': _extract_match_type,
+    'cell_decision': _extract_cell_decision,
+    'array_neighborhood': _extract_array_neighborhood,
+    'score_competition': _extract_score_competition,
+    'ornament_processing': _extract_ornament_processing,
+    'window_movement': _extract_window_movement,
+}
 
 
-def parse_log_line(line: str) -> Optional[Dict[str, Any]]:
-    """Parse a single log line according to our debug format."""
+def parse_log_line(line: str, keep_raw: bool = False) -> Optional[Dict[str, Any]]:
+    """Parse a single log line according to our debug format.
+    
+    The result holds the log type and its extracted fields. Log types without a field
+    extractor (CEVENT and the *_EXPLAIN lines) carry their regex 'groups' instead. With
+    keep_raw, every result also holds the stripped 'raw_line' and 'groups', for debugging the
+    parser itself.
+    """
     line = line.strip()
     
     # Skip empty lines and comments (these are valid to skip)
     if not line or line.startswith('#'):
         return None
     
-    # Try each pattern
-    for pattern_name, pattern in LOG_PATTERNS.items():
-        match = re.match(pattern, line)
-        if match:
-            result = {
-                'type': pattern_name,
-                'raw_line': line,
-                'groups': match.groups()
-            }
-            
-            # Parse specific patterns
-            if pattern_name == 'dp_entry':
-                result.update({
-                    'column': int(match.group(1)),
-                    'row': int(match.group(2)),
-                    'pitch': int(match.group(3)),
-                    'time': float(match.group(4)),
-                    'vertical_rule': float(match.group(5)),
-                    'horizontal_rule': float(match.group(6)),
-                    'final_value': float(match.group(7)),
-                    'match_flag': bool(int(match.group(8))),
-                    'used_pitches': parse_pitch_list(match.group(9)),
-                    'unused_count': int(match.group(10))
-                })
-            elif pattern_name == 'match_found':
-                result.update({
-                    'row': int(match.group(1)),
-                    'pitch': int(match.group(2)),
-                    'time': float(match.group(3)),
-                    'score': float(match.group(4))
-                })
-            elif pattern_name == 'no_match':
-                result.update({
-                    'pitch': int(match.group(1)),
-                    'time': float(match.group(2))
-                })
-            elif pattern_name == 'test_start':
-                result.update({
-                    'test_case': int(match.group(1)),
-                    'score_file': match.group(2),
-                    'performance_file': match.group(3)
-                })
-            elif pattern_name == 'test_end':
-                result.update({
-                    'test_case': int(match.group(1)),
-                    'matches': int(match.group(2)),
-                    'total_notes': int(match.group(3))
-                })
-            # Ultra-comprehensive logging patterns
-            elif pattern_name == 'input_event':
-                result.update({
-                    'column': int(match.group(1)),
-                    'pitch': int(match.group(2)),
-                    'time': float(match.group(3))
-                })
-            elif pattern_name == 'matrix_state':
-                result.update({
-                    'column': int(match.group(1)),
-                    'window_start': int(match.group(2)),
-                    'window_end': int(match.group(3)),
-                    'window_center': int(match.group(4)),
-                    'current_base': int(match.group(5)),
-                    'prev_base': int(match.group(6)),
-                    'current_upper': int(match.group(7)),
-                    'prev_upper': int(match.group(8))
-                })
-            elif pattern_name == 'cell_state':
-                result.update({
-                    'row': int(match.group(1)),
-                    'value': float(match.group(2)),
-                    'used_pitches': parse_pitch_list(match.group(3)),
-                    'unused_count': int(match.group(4)),
-                    'time': float(match.group(5))
-                })
-            elif pattern_name == 'vertical_rule':
-                result.update({
-                    'row': int(match.group(1)),
-                    'up_value': float(match.group(2)),
-                    'penalty': float(match.group(3)),
-                    'result': float(match.group(4)),
-                    'start_point': match.group(5) == 't'
-                })
-            elif pattern_name == 'horizontal_rule':
-                result.update({
-                    'row': int(match.group(1)),
-                    'prev_value': float(match.group(2)),
-                    'pitch': int(match.group(3)),
-                    'ioi': float(match.group(4)),
-                    'limit': float(match.group(5)),
-                    'timing_pass': match.group(6) == 't',
-                    'match_type': match.group(7),
-                    'result': float(match.group(8))
-                })
-            elif pattern_name == 'timing_check':
-                result.update({
-                    'prev_time': float(match.group(1)),
-                    'curr_time': float(match.group(2)),
-                    'ioi': float(match.group(3)),
-                    'span': float(match.group(4)),
-                    'limit': float(match.group(5)),
-                    'timing_pass': match.group(6) == 't',
-                    'constraint_type': match.group(7)
-                })
-            elif pattern_name == 'match_type':
-                result.update({
-                    'pitch': int(match.group(1)),
-                    'is_chord': match.group(2) == 't',
-                    'is_trill': match.group(3) == 't',
-                    'is_grace': match.group(4) == 't',
-                    'is_extra': match.group(5) == 't',
-                    'is_ignored': match.group(6) == 't',
-                    'already_used': match.group(7) == 't',
-                    'timing_ok': match.group(8) == 't',
-                    'ornament_info': match.group(9)
-                })
-            elif pattern_name == 'cell_decision':
-                result.update({
-                    'row': int(match.group(1)),
-                    'vertical_result': float(match.group(2)),
-                    'horizontal_result': float(match.group(3)),
-                    'winner': match.group(4),
-                    'updated': match.group(5) == 't',
-                    'final_value': float(match.group(6)),
-                    'reason': match.group(7)
-                })
-            elif pattern_name == 'array_neighborhood':
-                # Parse the comma-separated values
-                vals_str = match.group(2)
-                neighbor_values = [float(v.strip()) for v in vals_str.split(',') if v.strip()]
-                positions_str = match.group(3)
-                positions = [int(p.strip()) for p in positions_str.split(',') if p.strip()]
-                if not neighbor_values:
-                    raise ValueError(f"Array neighborhood at line '{line}' has no neighbor values - parsing error")
-                result.update({
-                    'row': int(match.group(1)),
-                    'center_value': neighbor_values[len(neighbor_values)//2],
-                    'neighbor_values': neighbor_values,
-                    'positions': positions
-                })
-            elif pattern_name == 'score_competition':
-                result.update({
-                    'row': int(match.group(1)),
-                    'current_score': float(match.group(2)),
-                    'top_score': float(match.group(3)),
-                    'beats_top': match.group(4) == 't',
-                    'margin': float(match.group(5)),
-                    'confidence': float(match.group(6))
-                })
-            elif pattern_name == 'ornament_processing':
-                result.update({
-                    'pitch': int(match.group(1)),
-                    'ornament_type': match.group(2),
-                    'trill_pitches': parse_pitch_list(match.group(3)),
-                    'grace_pitches': parse_pitch_list(match.group(4)),
-                    'ignore_pitches': parse_pitch_list(match.group(5)),
-                    'credit': float(match.group(6))
-                })
-            elif pattern_name == 'window_movement':
-                result.update({
-                    'old_center': int(match.group(1)),
-                    'new_center': int(match.group(2)),
-                    'old_start': int(match.group(3)),
-                    'new_start': int(match.group(4)),
-                    'old_end': int(match.group(5)),
-                    'new_end': int(match.group(6)),
-                    'reason': match.group(7)
-                })
-            
-            return result
+    # One pass over all patterns; the named group that matched is the log type
+    match = _COMBINED_PATTERN.match(line)
+    if match:
+        pattern_name = match.lastgroup
+        start, end = _GROUP_SLICES[pattern_name]
+        groups = match.groups()[start:end]
+        
+        # Parse specific patterns; each extractor builds the whole result dict in one go.
+        # Types without an extractor keep their raw groups so no data is lost.
+        extractor = _EXTRACTORS.get(pattern_name)
+        result = extractor(line, groups) if extractor is not None else {'type': pattern_name, 'groups': groups}
+        
+        if keep_raw:
+            result['raw_line'] = line
+            result['groups'] = groups
+        return result
     
     # No pattern matched - this is normal for Serpent output lines, just skip them
     return None
 
 
+def parse_log_parallel(log_file: Path, n_workers: Optional[int] = None, keep_raw: bool = False) -> List[Dict[str, Any]]:
+    """Parse every line of a log file across worker processes.
+    
+    Returns the non-None parse_log_line() results in file order, the same as parsing the
+    iter_log_lines() output serially. The file is split into one newline-aligned byte range
+    per worker; n_workers defaults to all cores but two, leaving room for the rest of the
+    system.
+    """
+    if n_workers is None:
+        n_workers = max(1, (os.cpu_count() or 1) - 2)
+    elif n_workers < 1:
+        raise ValueError(f"n_workers must be at least 1, got {n_workers}")
+    ranges = _split_at_newlines(log_file, n_workers)
+    if len(ranges) <= 1:
+        return [entry for entry in (parse_log_line(line, keep_raw) for line in iter_log_lines(log_file))
+                if entry is not None]
+    
+    entries = []
+    with ProcessPoolExecutor(max_workers=len(ranges)) as executor:
+        for chunk_entries in executor.map(_parse_log_range, [log_file] * len(ranges), *zip(*ranges),
+                                          [keep_raw] * len(ranges)):
+            entries.extend(chunk_entries)
+    return entries
+
+
+def _split_at_newlines(log_file: Path, chunks: int) -> List[Tuple[int, int]]:
+    """Split a file into at most `chunks` (start, end) byte ranges that each end after a newline."""
+    with open(log_file, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return []
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            boundaries = [0]
+            for i in range(1, chunks):
+                newline = mm.find(b'\n', max(size * i // chunks, boundaries[-1]))
+                if newline == -1:
+                    break
+                boundaries.append(newline + 1)
+    if boundaries[-1] < size:
+        boundaries.append(size)
+    return list(zip(boundaries, boundaries[1:]))
+
+
+def _parse_log_range(log_file: Path, start: int, end: int, keep_raw: bool) -> List[Dict[str, Any]]:
+    """Worker entry point for parse_log_parallel: parse the lines in byte range [start, end)."""
+    with open(log_file, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+    # Decode and split lines exactly as iter_log_lines() does
+    lines = io.StringIO(data.decode('utf-8', errors='replace'), newline=None)
+    return [entry for entry in (parse_log_line(line, keep_raw) for line in lines) if entry is not None]
+
+
 def save_json(data: Any, filepath: Path) -> None:
     """Save data as JSON with proper formatting."""
     with open(filepath, 'w', encoding='utf-8') as f:
@@ -312,32 +553,158 @@ def format_duration(seconds: float) -> str:
         return f"{minutes}m{secs:.1f}s"
 
 
-def summarize_decision_sequence(decisions: List[Dict[str, Any]]) -> Dict[str, Any]:
-    """Summarize a sequence of DP decisions for analysis."""
-    if not decisions:
+def positive_int(value: str) -> int:
+    """argparse type for counts that must be at least 1, such as --workers."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid count: {value!r} (expected a positive integer)")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"Invalid count: {value!r} (must be at least 1)")
+    return number
+
+
+# Structured dtype for decision arrays: one column per field summarize_decision_sequence reads.
+# Times and values stay float64 so summaries match the parsed Python floats exactly.
+DECISION_DTYPE = [
+    ('column', 'i4'), ('row', 'i4'), ('pitch', 'i4'),
+    ('time', 'f8'), ('final_value', 'f8'), ('match_flag', '?')
+]
+
+
+def decisions_to_array(decisions: List[Dict[str, Any]]) -> 'np.ndarray':
+    """Convert parsed DP decisions into a structured NumPy array (one column per field).
+    
+    Requires numpy. Build the array once and pass it to summarize_decision_sequence() so the
+    summary is computed with vectorized reductions instead of per-dict scans.
+    """
+    if np is None:
+        raise ImportError("decisions_to_array requires numpy (see requirements.txt)")
+    names = [name for name, _ in DECISION_DTYPE]
+    for i, d in enumerate(decisions):
+        missing_fields = [field for field in names if field not in d]
+        if missing_fields:
+            raise ValueError(f"Decision {i} missing required fields: {missing_fields}")
+    return np.array([tuple(d[name] for name in names) for d in decisions], dtype=DECISION_DTYPE)
+
+
+# read_dp_entries() columns: the DECISION_DTYPE fields plus the remaining scalars of a DP| line
+DP_ENTRY_DTYPE = DECISION_DTYPE + [
+    ('vertical_rule', 'f8'), ('horizontal_rule', 'f8'), ('unused_count', 'i4')
+]
+
+# DP| lines anywhere in a log buffer; parse_log_line() strips leading whitespace, so allow it here too
+_DP_RECORD = re.compile(rb'^[ \t]*' + LOG_PATTERNS['dp_entry'].encode('ascii'), re.MULTILINE)
+
+# Index of each numeric DP_ENTRY_DTYPE field among the dp_entry pattern's groups (match_flag is group 7)
+_DP_NUMERIC_GROUPS = {
+    'column': 0, 'row': 1, 'pitch': 2, 'time': 3, 'vertical_rule': 4,
+    'horizontal_rule': 5, 'final_value': 6, 'unused_count': 9
+}
+
+
+def read_dp_entries(log_file: Path) -> 'np.ndarray':
+    """Parse every DP| line of a log file straight into a structured array of DP_ENTRY_DTYPE.
+    
+    Requires numpy. The file is scanned once with a bytes regex and each field is converted
+    column-wise by NumPy, so no per-entry dicts or Python numbers are built. used_pitches is
+    not included (use parse_log_line() for it). The result can be passed directly to
+    summarize_decision_sequence().
+    """
+    if np is None:
+        raise ImportError("read_dp_entries requires numpy (see requirements.txt)")
+    with open(log_file, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            rows = []
+        else:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                rows = _DP_RECORD.findall(mm)
+    
+    entries = np.empty(len(rows), dtype=DP_ENTRY_DTYPE)
+    if rows:
+        fields = list(zip(*rows))
+        for name, index in _DP_NUMERIC_GROUPS.items():
+            entries[name] = np.array(fields[index]).astype(entries.dtype[name])
+        entries['match_flag'] = np.array(fields[7]) == b'1'
+    return entries
+
+
+def summarize_decision_sequence(decisions) -> Dict[str, Any]:
+    """Summarize a sequence of DP decisions for analysis.
+    
+    Accepts a list of parsed decision dicts, or a structured array from decisions_to_array().
+    """
+    if not len(decisions):
         raise ValueError("Cannot summarize empty decision sequence - no decisions provided")
     
     # Validate all decisions have required fields
     required_fields = ['time', 'pitch', 'final_value', 'match_flag', 'column', 'row']
-    for i, d in enumerate(decisions):
-        missing_fields = [field for field in required_fields if field not in d]
+    
+    if np is not None and isinstance(decisions, np.ndarray):
+        missing_fields = [field for field in required_fields if field not in (decisions.dtype.names or ())]
         if missing_fields:
-            raise ValueError(f"Decision {i} missing required fields: {missing_fields}")
+            raise ValueError(f"Decision array missing required fields: {missing_fields}")
+        return _summarize_columns(
+            decisions['time'], decisions['pitch'], decisions['final_value'].tolist(),
+            decisions['match_flag'], decisions['column'], decisions['row']
+        )
+    
+    # Pull each field out with a C-level itemgetter pass instead of validating every dict up front;
+    # a missing field surfaces as KeyError and is then reported as before
+    try:
+        final_values = list(map(itemgetter('final_value'), decisions))
+        if np is not None:
+            def column(field: str, dtype) -> 'np.ndarray':
+                return np.fromiter(map(itemgetter(field), decisions), dtype=dtype, count=len(decisions))
+            
+            return _summarize_columns(
+                column('time', np.float64), column('pitch', np.int64), final_values,
+                column('match_flag', np.bool_), column('column', np.int64), column('row', np.int64)
+            )
+        times, pitches, match_flags, columns, rows = (
+            list(map(itemgetter(field), decisions)) for field in ('time', 'pitch', 'match_flag', 'column', 'row')
+        )
+    except KeyError:
+        for i, d in enumerate(decisions):
+            missing_fields = [field for field in required_fields if field not in d]
+            if missing_fields:
+                raise ValueError(f"Decision {i} missing required fields: {missing_fields}")
+        raise
     
     return {
         'count': len(decisions),
         'time_range': {
-            'start': min(d['time'] for d in decisions),
-            'end': max(d['time'] for d in decisions)
+            'start': min(times),
+            'end': max(times)
+        },
+        'pitch_range': {
+            'min': min(pitches),
+            'max': max(pitches)
+        },
+        'score_progression': final_values,
+        'match_count': sum(1 for flag in match_flags if flag),
+        'columns': sorted(set(columns)),
+        'rows': sorted(set(rows))
+    }
+
+
+def _summarize_columns(times: 'np.ndarray', pitches: 'np.ndarray', final_values: list,
+                       match_flags: 'np.ndarray', columns: 'np.ndarray', rows: 'np.ndarray') -> Dict[str, Any]:
+    """Vectorized summary for summarize_decision_sequence(), one NumPy column per field."""
+    return {
+        'count': len(times),
+        'time_range': {
+            'start': times.min().item(),
+            'end': times.max().item()
         },
         'pitch_range': {
-            'min': min(d['pitch'] for d in decisions),
-            'max': max(d['pitch'] for d in decisions)
+            'min': pitches.min().item(),
+            'max': pitches.max().item()
         },
-        'score_progression': [d['final_value'] for d in decisions],
-        'match_count': sum(1 for d in decisions if d['match_flag']),
-        'columns': sorted(set(d['column'] for d in decisions)),
-        'rows': sorted(set(d['row'] for d in decisions))
+        'score_progression': final_values,
+        'match_count': int(np.count_nonzero(match_flags)),
+        'columns': np.unique(columns).tolist(),
+        'rows': np.unique(rows).tolist()
     }
 
 
@@ -345,7 +712,8 @@ class DebugMetrics:
     """Track metrics during debug analysis."""
     
     def __init__(self):
-        self.start_time = datetime.now()
+        self.start_time = datetime.now()  # wall clock, for display
+        self.start_ns = time.perf_counter_ns()  # monotonic, for measuring duration
         self.lines_processed = 0
         self.dp_entries = 0
         self.matches_found = 0
@@ -364,7 +732,7 @@ class DebugMetrics:
         self.failures_detected += 1
     
     def get_summary(self) -> Dict[str, Any]:
-        duration = (datetime.now() - self.start_time).total_seconds()
+        duration = (time.perf_counter_ns() - self.start_ns) / 1e9
         
         if duration <= 0:
             raise RuntimeError(f"Invalid duration {duration} seconds - processing time calculation failed")